@@ -0,0 +1,133 @@
+# -------------------------------
+# Dashboard airport queries
+# -------------------------------
+# Every query is a fixed SQL string with bound parameters, returned as
+# (sql, params) for run_query() in streamlit-dashboard.py. User input never
+# becomes part of the SQL text, so statements are cached by SQLAlchemy and
+# the searches are prefix matches that MySQL answers from the CityCode,
+# CountryCode and CountryName indexes instead of scanning the table.
+AIRPORT_COLUMNS = "AirportCode, CityCode, CountryCode, CountryName, Latitude, Longitude"
+
+AIRPORT_BY_CODE = f"SELECT {AIRPORT_COLUMNS} FROM airports WHERE AirportCode = :code"
+
+AIRPORTS_BY_CITY_PREFIX = f"""
+    SELECT {AIRPORT_COLUMNS} FROM airports
+    WHERE CityCode LIKE :city
+    ORDER BY CityCode, AirportCode
+    LIMIT :limit
+"""
+
+AIRPORTS_BY_COUNTRY_PREFIX = f"""
+    SELECT {AIRPORT_COLUMNS} FROM airports
+    WHERE CountryName LIKE :country OR CountryCode = :country_code
+    ORDER BY CountryName, AirportCode
+    LIMIT :limit
+"""
+
+AIRPORTS_BY_CITY_AND_COUNTRY_PREFIX = f"""
+    SELECT {AIRPORT_COLUMNS} FROM airports
+    WHERE CityCode LIKE :city AND (CountryName LIKE :country OR CountryCode = :country_code)
+    ORDER BY CityCode, AirportCode
+    LIMIT :limit
+"""
+
+# The dashboard's shared in-memory airport dataset, and the generation
+# counter the importer bumps whenever airports change
+AIRPORT_DATASET = f"SELECT {AIRPORT_COLUMNS} FROM airports"
+AIRPORTS_GENERATION = "SELECT Generation FROM data_generations WHERE Dataset = 'airports'"
+
+# Summary tables the importer refreshes with every sync (airport_summaries.py)
+SYNC_SUMMARY = "SELECT * FROM airport_sync_summary WHERE Dataset = 'airports'"
+TOP_COUNTRIES = """
+    SELECT CountryName AS country, AirportCount AS airport_count FROM airport_country_summary
+    ORDER BY AirportCount DESC, CountryCode
+    LIMIT :limit
+"""
+
+
+def like_prefix(value):
+    # Escape LIKE wildcards so user input only ever matches literally
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def airport_by_code(code):
+    return AIRPORT_BY_CODE, {"code": code.strip().upper()}
+
+
+def search_airports(city=None, country=None, limit=20):
+    city = (city or "").strip()
+    country = (country or "").strip()
+    params = {"limit": int(limit)}
+    if city:
+        params["city"] = like_prefix(city.upper())
+    if country:
+        params["country"] = like_prefix(country)
+        params["country_code"] = country.upper()
+
+    if city and country:
+        return AIRPORTS_BY_CITY_AND_COUNTRY_PREFIX, params
+    if city:
+        return AIRPORTS_BY_CITY_PREFIX, params
+    if country:
+        return AIRPORTS_BY_COUNTRY_PREFIX, params
+    return None, None
+
+
+# -------------------------------
+# In-process autocomplete
+# -------------------------------
+class PrefixTrie:
+    # Case-insensitive prefix tree; every key maps to one or more
+    # suggestions, and complete() returns them in key order
+    VALUES = object()
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def insert(self, key, value):
+        node = self.root
+        for char in key.casefold():
+            node = node.setdefault(char, {})
+        values = node.setdefault(self.VALUES, [])
+        if value not in values:
+            values.append(value)
+            self.size += 1
+
+    def complete(self, prefix, limit=10):
+        node = self.root
+        for char in prefix.casefold():
+            node = node.get(char)
+            if node is None:
+                return []
+
+        results = []
+        stack = [node]
+        while stack and len(results) < limit:
+            node = stack.pop()
+            # A value reachable from several keys (a country by name and by
+            # code) is suggested once
+            results.extend(value for value in node.get(self.VALUES, ()) if value not in results)
+            # Push children in reverse so the smallest key is visited first
+            children = sorted((char for char in node if char is not self.VALUES), reverse=True)
+            stack.extend(node[char] for char in children)
+        return results[:limit]
+
+
+def build_autocomplete(df_airports):
+    # One trie per kind, so type-ahead for airports, cities and countries
+    # is answered from memory without touching MySQL
+    tries = {"airport": PrefixTrie(), "city": PrefixTrie(), "country": PrefixTrie()}
+    for airport_code, city_code, country_code, country_name in df_airports[
+        ["AirportCode", "CityCode", "CountryCode", "CountryName"]
+    ].itertuples(index=False, name=None):
+        if isinstance(airport_code, str):
+            tries["airport"].insert(airport_code, airport_code)
+        if isinstance(city_code, str):
+            tries["city"].insert(city_code, city_code)
+        if isinstance(country_name, str):
+            tries["country"].insert(country_name, country_name)
+            if isinstance(country_code, str):
+                tries["country"].insert(country_code, country_name)
+    return tries
@@ -18,5 +18,141 @@ CREATE TABLE IF NOT EXISTS airports (
     CountryCode VARCHAR(10),
     CountryName VARCHAR(100),
     Latitude DECIMAL(10, 6),
-    Longitude DECIMAL(10, 6)
+    Longitude DECIMAL(10, 6),
+    ContentHash CHAR(32),
+    UpdatedAt TIMESTAMP NULL,
+    -- Prefix searches from the dashboard (dashboard_queries.py)
+    INDEX idx_airports_city (CityCode),
+    INDEX idx_airports_country_code (CountryCode),
+    INDEX idx_airports_country_name (CountryName)
+);
+
+-- One row per import run that changed airports, with the affected codes
+CREATE TABLE IF NOT EXISTS airport_change_log (
+    RunId BIGINT AUTO_INCREMENT PRIMARY KEY,
+    Generation BIGINT NOT NULL,
+    RunAt TIMESTAMP NOT NULL,
+    Inserted INT NOT NULL,
+    Updated INT NOT NULL,
+    Deleted INT NOT NULL,
+    InsertedCodes JSON,
+    UpdatedCodes JSON,
+    DeletedCodes JSON
+);
+
+-- Generation counter bumped by every import; the Flask app polls it to hot-reload data
+CREATE TABLE IF NOT EXISTS data_generations (
+    Dataset VARCHAR(50) PRIMARY KEY,
+    Generation BIGINT NOT NULL DEFAULT 0,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Background import jobs queued by POST /run_data_import
+CREATE TABLE IF NOT EXISTS import_jobs (
+    JobId VARCHAR(36) PRIMARY KEY,
+    Status VARCHAR(20) NOT NULL,
+    CreatedAt DOUBLE NOT NULL,
+    StartedAt DOUBLE NULL,
+    FinishedAt DOUBLE NULL,
+    UpdatedAt DOUBLE NOT NULL,
+    PagesFetched INT NOT NULL DEFAULT 0,
+    RowsUpserted INT NOT NULL DEFAULT 0,
+    RowsDeleted INT NOT NULL DEFAULT 0,
+    Output MEDIUMTEXT,
+    Error TEXT,
+    INDEX idx_import_jobs_status (Status)
+);
+
+-- One row per importer run: per-stage timings, row counts, bytes received
+CREATE TABLE IF NOT EXISTS import_runs (
+    RunId BIGINT AUTO_INCREMENT PRIMARY KEY,
+    JobId VARCHAR(36) NULL,
+    Status VARCHAR(20) NOT NULL,
+    StartedAt TIMESTAMP NOT NULL,
+    FinishedAt TIMESTAMP NOT NULL,
+    TotalSeconds DOUBLE NOT NULL,
+    Pages INT NOT NULL DEFAULT 0,
+    AirportsFetched INT NOT NULL DEFAULT 0,
+    RowsInserted INT NOT NULL DEFAULT 0,
+    RowsUpdated INT NOT NULL DEFAULT 0,
+    RowsDeleted INT NOT NULL DEFAULT 0,
+    BytesReceived BIGINT NOT NULL DEFAULT 0,
+    TokensRequested INT NOT NULL DEFAULT 0,
+    Generation BIGINT NULL,
+    StageTimings JSON,
+    PageTimings JSON,
+    Profile MEDIUMTEXT,
+    Error TEXT,
+    INDEX idx_import_runs_job (JobId),
+    INDEX idx_import_runs_started (StartedAt)
+);
+
+-- Country code -> name lookup used by the importer instead of per-row pycountry calls
+CREATE TABLE IF NOT EXISTS country_names (
+    CountryCode VARCHAR(10) PRIMARY KEY,
+    CountryName VARCHAR(100) NOT NULL
+);
+
+-- Summaries refreshed by every import in the same transaction as the sync (airport_summaries.py)
+CREATE TABLE IF NOT EXISTS airport_country_summary (
+    CountryCode VARCHAR(10) PRIMARY KEY,
+    CountryName VARCHAR(100),
+    AirportCount INT NOT NULL,
+    INDEX idx_country_summary_count (AirportCount)
+);
+
+CREATE TABLE IF NOT EXISTS airport_city_summary (
+    CityCode VARCHAR(10) PRIMARY KEY,
+    CountryCode VARCHAR(10),
+    AirportCount INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS airport_sync_summary (
+    Dataset VARCHAR(50) PRIMARY KEY,
+    Generation BIGINT NOT NULL,
+    TotalAirports INT NOT NULL,
+    MissingCityCode INT NOT NULL,
+    MissingCountryName INT NOT NULL,
+    MissingCoordinates INT NOT NULL,
+    LastSyncAt TIMESTAMP NULL,
+    LastChangeAt TIMESTAMP NULL,
+    LastInserted INT NOT NULL DEFAULT 0,
+    LastUpdated INT NOT NULL DEFAULT 0,
+    LastDeleted INT NOT NULL DEFAULT 0
+);
+
+-- Reference datasets crawled alongside the airports (workspace/reference_datasets.py)
+CREATE TABLE IF NOT EXISTS airlines (
+    AirlineID VARCHAR(10) NOT NULL,
+    AirlineICAO VARCHAR(10),
+    AirlineName VARCHAR(255),
+    UpdatedAt TIMESTAMP NULL,
+    PRIMARY KEY (AirlineID)
+);
+
+CREATE TABLE IF NOT EXISTS cities (
+    CityCode VARCHAR(10) NOT NULL,
+    CountryCode VARCHAR(10),
+    CityName VARCHAR(255),
+    UtcOffset VARCHAR(10),
+    TimeZoneId VARCHAR(64),
+    AirportCodes TEXT,
+    UpdatedAt TIMESTAMP NULL,
+    PRIMARY KEY (CityCode)
+);
+
+CREATE TABLE IF NOT EXISTS countries (
+    CountryCode VARCHAR(10) NOT NULL,
+    ZoneCode VARCHAR(10),
+    CountryName VARCHAR(255),
+    UpdatedAt TIMESTAMP NULL,
+    PRIMARY KEY (CountryCode)
+);
+
+CREATE TABLE IF NOT EXISTS aircraft (
+    AircraftCode VARCHAR(10) NOT NULL,
+    AircraftName VARCHAR(255),
+    AirlineEquipCode VARCHAR(10),
+    UpdatedAt TIMESTAMP NULL,
+    PRIMARY KEY (AircraftCode)
 );
\ No newline at end of file
@@ -1,14 +1,19 @@
 import streamlit as st
 import pandas as pd
-import mysql.connector
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import folium
 from streamlit_folium import st_folium
 import requests
 import os
+import re
+import time
+import threading
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL
 from dotenv import load_dotenv
+import dashboard_queries
 
 load_dotenv()
 
@@ -36,49 +41,156 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# -------------------------------
+# Pooled database access
+# -------------------------------
+class PoolWaitStats:
+    # How long queries waited to check a connection out of the pool
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, seconds):
+        with self.lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def average_ms(self):
+        with self.lock:
+            return 1000 * self.total_wait / self.checkouts if self.checkouts else 0.0
+
 @st.cache_resource
-def init_connection():
-    try:
-        connection = mysql.connector.connect(
-            host=os.getenv('MYSQL_HOST', 'localhost'),
-            port=int(os.getenv('MYSQL_PORT', 3306)),
-            user=os.getenv('MYSQL_USER', 'root'),
-            password=os.getenv('MYSQL_PASSWORD'),
-            database=os.getenv('MYSQL_DATABASE', 'airlines_db'),
-            charset='utf8mb4',
-            collation='utf8mb4_unicode_ci'
-        )
-        return connection
-    except mysql.connector.Error as e:
-        st.error(f"Database connection failed: {e}")
-        return None
+def init_engine():
+    # One connection pool per Streamlit server, shared by every session.
+    # Each query checks a connection out and returns it when it is done;
+    # pool_pre_ping replaces connections MySQL has dropped.
+    url = URL.create(
+        "mysql+mysqlconnector",
+        username=os.getenv('MYSQL_USER', 'root'),
+        password=os.getenv('MYSQL_PASSWORD'),
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        port=int(os.getenv('MYSQL_PORT', 3306)),
+        database=os.getenv('MYSQL_DATABASE', 'airlines_db')
+    )
+    return create_engine(
+        url,
+        connect_args={'charset': 'utf8mb4', 'collation': 'utf8mb4_unicode_ci'},
+        pool_size=int(os.getenv('MYSQL_POOL_SIZE', 5)),
+        max_overflow=int(os.getenv('MYSQL_POOL_OVERFLOW', 5)),
+        pool_timeout=int(os.getenv('MYSQL_POOL_TIMEOUT', 30)),
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
+
+@st.cache_resource
+def pool_wait_stats():
+    return PoolWaitStats()
 
 @st.cache_data(ttl=300)
-def run_query(query):
-    conn = init_connection()
-    if conn is None:
-        return pd.DataFrame()
-    
+def run_query(query, params=None):
+    return run_query_uncached(query, params)
+
+def run_query_uncached(query, params=None):
+    # Parameterized queries (see dashboard_queries.py) pass their values in
+    # params; they are bound by the driver, never formatted into the SQL
+    engine = init_engine()
     try:
-        df = pd.read_sql(query, conn)
-        return df
+        started = time.perf_counter()
+        with engine.connect() as conn:
+            pool_wait_stats().record(time.perf_counter() - started)
+            if params is None:
+                return pd.read_sql(query, conn)
+            return pd.read_sql(text(query), conn, params=params)
     except Exception as e:
         st.error(f"Query execution failed: {e}")
         return pd.DataFrame()
-    finally:
-        if conn:
-            conn.close()
+
+# -------------------------------
+# Shared airport dataset
+# -------------------------------
+# Every airport widget derives its numbers from one in-memory copy of the
+# airports table, loaded once per data generation and shared by all
+# sessions. Switching pages costs no queries; the only recurring query is
+# the cheap generation check below.
+@st.cache_data(ttl=int(os.getenv('DASHBOARD_GENERATION_POLL', 30)))
+def current_generation():
+    with init_engine().connect() as conn:
+        generation = conn.execute(text(dashboard_queries.AIRPORTS_GENERATION)).scalar()
+    return generation or 0
+
+@st.cache_resource(max_entries=2)
+def load_airport_dataset(generation):
+    # Shared, not copied, between sessions: widgets must not modify it
+    with init_engine().connect() as conn:
+        df = pd.read_sql(dashboard_queries.AIRPORT_DATASET, conn)
+    for column in ['Latitude', 'Longitude']:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    df.attrs['generation'] = generation
+    df.attrs['loaded_at'] = datetime.now()
+    return df
+
+def airport_dataset():
+    try:
+        return load_airport_dataset(current_generation())
+    except Exception as e:
+        st.error(f"Could not load airport data: {e}")
+        return pd.DataFrame(columns=['AirportCode', 'CityCode', 'CountryCode', 'CountryName', 'Latitude', 'Longitude'])
+
+# Importer-maintained summaries: one-row and top-N reads, never a scan
+@st.cache_data(ttl=int(os.getenv('DASHBOARD_GENERATION_POLL', 30)))
+def sync_summary():
+    summary = run_query_uncached(dashboard_queries.SYNC_SUMMARY)
+    return summary.iloc[0] if not summary.empty else None
+
+@st.cache_data(max_entries=2)
+def top_countries(generation, limit=10):
+    return run_query_uncached(dashboard_queries.TOP_COUNTRIES, {'limit': limit})
+
+def format_age(timestamp):
+    # The importer stores its run times in UTC
+    if timestamp is None or pd.isna(timestamp):
+        return "Never"
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    seconds = max(0, int((now - pd.Timestamp(timestamp).to_pydatetime()).total_seconds()))
+    if seconds < 60:
+        return f"{seconds} s ago"
+    if seconds < 3600:
+        return f"{seconds // 60} min ago"
+    if seconds < 86400:
+        return f"{seconds // 3600} h {seconds % 3600 // 60} min ago"
+    return f"{seconds // 86400} days ago"
+
+@st.cache_resource(max_entries=2)
+def build_airport_autocomplete(generation):
+    return dashboard_queries.build_autocomplete(load_airport_dataset(generation))
+
+def airport_autocomplete():
+    # Prefix tries over airport, city and country names for the current generation
+    try:
+        return build_airport_autocomplete(current_generation())
+    except Exception as e:
+        st.error(f"Could not load airport data: {e}")
+        return dashboard_queries.build_autocomplete(airport_dataset())
 
 @st.cache_data(ttl=600)
 def call_flask_api(endpoint, data=None):
-    base_url = "http://localhost:5001"
+    return request_flask_api(endpoint, data)
+
+FLASK_BASE_URL = "http://localhost:5001"
+
+def request_flask_api(endpoint, data=None):
+    # Uncached variant for calls with side effects or fast-changing answers
+    base_url = FLASK_BASE_URL
     try:
         if data:
             response = requests.post(f"{base_url}/{endpoint}", json=data, timeout=10)
         else:
             response = requests.get(f"{base_url}/{endpoint}", timeout=10)
         
-        if response.status_code == 200:
+        if response.ok:
             return response.json()
         else:
             st.error(f"API call failed: {response.status_code}")
@@ -87,6 +199,72 @@ def call_flask_api(endpoint, data=None):
         st.error(f"API connection failed: {e}")
         return None
 
+# -------------------------------
+# Flask service metrics (GET /metrics)
+# -------------------------------
+METRIC_LINE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+METRIC_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+def parse_prometheus(text_body):
+    # [(name, labels, value)] for every sample in a Prometheus text response
+    samples = []
+    for line in text_body.splitlines():
+        match = METRIC_LINE.match(line)
+        if match is None:
+            continue
+        name, labels, value = match.groups()
+        samples.append((name, dict(METRIC_LABEL.findall(labels or '')), float(value)))
+    return samples
+
+def fetch_flask_metrics():
+    try:
+        response = requests.get(f"{FLASK_BASE_URL}/metrics", timeout=10)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        st.error(f"Could not read Flask metrics: {e}")
+        return None
+    return parse_prometheus(response.text)
+
+def summarize_flask_metrics(samples):
+    # Request figures leave out the scrapes of /metrics itself
+    def total(name, include=lambda labels: True):
+        return sum(value for sample, labels, value in samples
+                   if sample == name and labels.get('endpoint') != '/metrics' and include(labels))
+
+    def single(name):
+        return next((value for sample, _, value in samples if sample == name), None)
+
+    requests_total = total('flask_http_requests_total')
+    errors = total('flask_http_requests_total', lambda labels: labels.get('status', '').startswith('5'))
+    latency_count = total('flask_http_request_duration_seconds_count')
+    latency_sum = total('flask_http_request_duration_seconds_sum')
+
+    buckets = {}
+    for sample, labels, value in samples:
+        if sample == 'flask_http_request_duration_seconds_bucket' and labels.get('endpoint') != '/metrics':
+            bound = float('inf') if labels['le'] == '+Inf' else float(labels['le'])
+            buckets[bound] = buckets.get(bound, 0) + value
+    p95 = next((bound for bound, count in sorted(buckets.items()) if count >= 0.95 * latency_count), None)
+
+    started = single('process_start_time_seconds')
+    return {
+        'uptime_seconds': time.time() - started if started else None,
+        'memory_bytes': single('process_resident_memory_bytes'),
+        'in_flight': total('flask_http_requests_in_flight'),
+        'requests_total': requests_total,
+        'error_rate': errors / requests_total if requests_total else 0.0,
+        'avg_latency_ms': 1000 * latency_sum / latency_count if latency_count else None,
+        'p95_latency_ms': 1000 * p95 if p95 not in (None, float('inf')) else None,
+        'snapshot_generation': single('airport_snapshot_generation'),
+        'snapshot_age_seconds': single('airport_snapshot_age_seconds'),
+    }
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
 def main():
     st.markdown('<h1 class="main-header">✈️ Airlines Data Dashboard</h1>', unsafe_allow_html=True)
     
@@ -115,9 +293,9 @@ def show_overview():
     
     with col1:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        airport_count = run_query("SELECT COUNT(*) as count FROM airports")
-        if not airport_count.empty:
-            st.metric("Total Airports", airport_count.iloc[0]['count'])
+        summary = sync_summary()
+        if summary is not None:
+            st.metric("Total Airports", int(summary['TotalAirports']))
         else:
             st.metric("Total Airports", "N/A")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -150,13 +328,7 @@ def show_overview():
     
     st.subheader("Data Visualizations")
     
-    airports_by_country = run_query("""
-        SELECT country, COUNT(*) as airport_count 
-        FROM airports 
-        GROUP BY country 
-        ORDER BY airport_count DESC 
-        LIMIT 10
-    """)
+    airports_by_country = top_countries(summary['Generation']) if summary is not None else pd.DataFrame()
     
     if not airports_by_country.empty:
         col1, col2 = st.columns(2)
@@ -199,70 +371,72 @@ def show_airport_search():
             result = call_flask_api("closest_airport", {"latitude": latitude, "longitude": longitude})
             
             if result:
-                st.success(f"Closest Airport: {result.get('airport_name', 'Unknown')}")
-                st.write(f"IATA Code: {result.get('iata_code', 'N/A')}")
-                st.write(f"Distance: {result.get('distance', 'N/A')} km")
+                st.success(f"Closest Airport: {result.get('AirportCode', 'Unknown')}")
+                st.write(f"City: {result.get('CityCode', 'N/A')}, {result.get('CountryName', 'N/A')}")
+                st.write(f"Distance: {result.get('DistanceKm', 'N/A')} km")
                 
-                if result.get('latitude') and result.get('longitude'):
-                    show_airport_map(result.get('latitude'), result.get('longitude'), result.get('airport_name'))
+                if result.get('Latitude') is not None and result.get('Longitude') is not None:
+                    show_airport_map(result.get('Latitude'), result.get('Longitude'), result.get('AirportCode'))
     
     elif search_method == "By Airport Code":
         st.subheader("Search by IATA Code")
         
-        iata_code = st.text_input("Enter IATA Code (e.g., CDG, JFK, LAX)").upper()
+        prefix = st.text_input("Enter IATA Code (e.g., CDG, JFK, LAX)").strip().upper()
         
-        if iata_code and len(iata_code) == 3:
-            airport_info = run_query(f"SELECT * FROM airports WHERE iata_code = '{iata_code}'")
+        if prefix:
+            # Type-ahead comes from the in-memory trie; only the chosen code is queried
+            suggestions = airport_autocomplete()["airport"].complete(prefix, limit=20)
+            if not suggestions:
+                st.error("Airport not found")
+                return
+            iata_code = suggestions[0] if len(suggestions) == 1 else st.selectbox("Matching airports", suggestions)
+            
+            airport_info = run_query(*dashboard_queries.airport_by_code(iata_code))
             
             if not airport_info.empty:
                 airport = airport_info.iloc[0]
-                st.success(f"Airport Found: {airport['name']}")
+                st.success(f"Airport Found: {airport['AirportCode']}")
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.write(f"**City:** {airport['city']}")
-                    st.write(f"**Country:** {airport['country']}")
-                    st.write(f"**IATA Code:** {airport['iata_code']}")
+                    st.write(f"**City:** {airport['CityCode']}")
+                    st.write(f"**Country:** {airport['CountryName']} ({airport['CountryCode']})")
+                    st.write(f"**IATA Code:** {airport['AirportCode']}")
                 
                 with col2:
-                    st.write(f"**Latitude:** {airport['latitude']}")
-                    st.write(f"**Longitude:** {airport['longitude']}")
-                    if 'elevation' in airport:
-                        st.write(f"**Elevation:** {airport['elevation']} ft")
+                    st.write(f"**Latitude:** {airport['Latitude']}")
+                    st.write(f"**Longitude:** {airport['Longitude']}")
                 
-                show_airport_map(airport['latitude'], airport['longitude'], airport['name'])
+                show_airport_map(float(airport['Latitude']), float(airport['Longitude']), airport['AirportCode'])
             else:
                 st.error("Airport not found")
     
     elif search_method == "By City/Country":
         st.subheader("Search by Location")
         
+        autocomplete = airport_autocomplete()
         col1, col2 = st.columns(2)
         with col1:
-            city = st.text_input("City (optional)")
+            city = st.text_input("City code (optional)")
+            if city:
+                st.caption(", ".join(autocomplete["city"].complete(city, limit=10)) or "No matching cities")
         with col2:
             country = st.text_input("Country (optional)")
-        
-        if city or country:
-            query = "SELECT * FROM airports WHERE 1=1"
-            if city:
-                query += f" AND city LIKE '%{city}%'"
             if country:
-                query += f" AND country LIKE '%{country}%'"
-            query += " LIMIT 20"
-            
-            airports = run_query(query)
+                st.caption(", ".join(autocomplete["country"].complete(country, limit=10)) or "No matching countries")
+        
+        query, params = dashboard_queries.search_airports(city, country, limit=20)
+        if query:
+            airports = run_query(query, params)
             
             if not airports.empty:
                 st.success(f"Found {len(airports)} airports")
                 
-                display_cols = ['name', 'city', 'country', 'iata_code', 'latitude', 'longitude']
-                available_cols = [col for col in display_cols if col in airports.columns]
-                st.dataframe(airports[available_cols])
+                st.dataframe(airports)
                 
-                selected_idx = st.selectbox("Select airport to view on map", range(len(airports)), format_func=lambda x: airports.iloc[x]['name'])
+                selected_idx = st.selectbox("Select airport to view on map", range(len(airports)), format_func=lambda x: airports.iloc[x]['AirportCode'])
                 selected_airport = airports.iloc[selected_idx]
-                show_airport_map(selected_airport['latitude'], selected_airport['longitude'], selected_airport['name'])
+                show_airport_map(float(selected_airport['Latitude']), float(selected_airport['Longitude']), selected_airport['AirportCode'])
             else:
                 st.error("No airports found")
 
@@ -283,16 +457,18 @@ def show_flight_analytics():
     
     st.subheader("Airport Statistics")
     
-    airports_data = run_query("SELECT latitude, longitude, name FROM airports LIMIT 1000")
+    airports = airport_dataset()
+    airports_data = airports.dropna(subset=['Latitude', 'Longitude'])
     
     if not airports_data.empty:
         st.subheader("Global Airport Distribution")
         
         fig = px.scatter_mapbox(
             airports_data,
-            lat="latitude",
-            lon="longitude",
-            hover_name="name",
+            lat="Latitude",
+            lon="Longitude",
+            hover_name="AirportCode",
+            hover_data=["CityCode", "CountryName"],
             zoom=2,
             height=500,
             mapbox_style="open-street-map"
@@ -305,24 +481,19 @@ def show_flight_analytics():
     col1, col2 = st.columns(2)
     
     with col1:
-        missing_data = run_query("""
-            SELECT 
-                SUM(CASE WHEN name IS NULL OR name = '' THEN 1 ELSE 0 END) as missing_names,
-                SUM(CASE WHEN latitude IS NULL THEN 1 ELSE 0 END) as missing_lat,
-                SUM(CASE WHEN longitude IS NULL THEN 1 ELSE 0 END) as missing_lon,
-                COUNT(*) as total_records
-            FROM airports
-        """)
-        
-        if not missing_data.empty:
-            data = missing_data.iloc[0]
-            st.metric("Total Records", data['total_records'])
-            st.metric("Missing Names", data['missing_names'])
-            st.metric("Missing Coordinates", data['missing_lat'] + data['missing_lon'])
+        summary = sync_summary()
+        if summary is not None:
+            st.metric("Total Records", int(summary['TotalAirports']))
+            st.metric("Missing Country Names", int(summary['MissingCountryName']))
+            st.metric("Missing Coordinates", int(summary['MissingCoordinates']))
     
     with col2:
-        st.metric("Data Freshness", "✅ Current")
-        st.metric("Last API Sync", "2 hours ago")
+        if summary is not None:
+            st.metric("Data Generation", int(summary['Generation']))
+            st.metric("Last API Sync", format_age(summary['LastSyncAt']))
+            st.metric("Last Data Change", format_age(summary['LastChangeAt']))
+        else:
+            st.metric("Last API Sync", "Never")
         st.metric("System Uptime", "99.8%")
 
 def show_data_management():
@@ -335,12 +506,25 @@ def show_data_management():
     with col1:
         st.write("**Import Data**")
         if st.button("🔄 Trigger Data Import"):
-            with st.spinner("Importing data..."):
-                result = call_flask_api("run_data_import", {})
-                if result:
-                    st.success("Data import completed successfully!")
+            result = request_flask_api("run_data_import", {})
+            if result:
+                st.session_state["import_job_id"] = result.get("job_id")
+                if result.get("coalesced"):
+                    st.info(f"An import is already {result.get('status')} (job {result.get('job_id')})")
                 else:
-                    st.error("Data import failed")
+                    st.success(f"Data import queued (job {result.get('job_id')})")
+            else:
+                st.error("Data import failed")
+        
+        job_id = st.session_state.get("import_job_id")
+        if job_id and st.button("⏱️ Check Import Status"):
+            job = request_flask_api(f"jobs/{job_id}")
+            if job:
+                st.write(f"**Status:** {job.get('status')}")
+                st.write(f"**Pages fetched:** {job.get('pages_fetched')}")
+                st.write(f"**Rows upserted:** {job.get('rows_upserted')}")
+                if job.get("duration_seconds") is not None:
+                    st.write(f"**Duration:** {job.get('duration_seconds')} s")
         
         if st.button("📊 Check Database Size"):
             st.info("Database size check initiated...")
@@ -349,7 +533,7 @@ def show_data_management():
         st.write("**Export Data**")
         
         export_format = st.selectbox("Export Format", ["CSV", "JSON", "Excel"])
-        table_to_export = st.selectbox("Table to Export", ["airports", "airlines", "routes"])
+        table_to_export = st.selectbox("Table to Export", ["airports", "airlines", "cities", "countries", "aircraft", "routes"])
         
         if st.button("📤 Export Data"):
             try:
@@ -372,7 +556,7 @@ def show_data_management():
     
     st.subheader("Data Preview")
     
-    table_name = st.selectbox("Select Table", ["airports", "airlines"])
+    table_name = st.selectbox("Select Table", ["airports", "airlines", "cities", "countries", "aircraft"])
     limit = st.slider("Number of records to display", 10, 100, 20)
     
     if st.button("Load Data"):
@@ -409,8 +593,16 @@ def show_system_health():
     
     st.subheader("Database Health")
     
-    db_conn = init_connection()
-    if db_conn:
+    engine = init_engine()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        db_connected = True
+    except Exception as e:
+        st.error(f"❌ Database connection failed: {e}")
+        db_connected = False
+    
+    if db_connected:
         st.success("✅ Database connection successful")
         
         try:
@@ -420,26 +612,78 @@ def show_system_health():
                 st.dataframe(stats[['Name', 'Rows', 'Data_length', 'Create_time']])
         except Exception as e:
             st.error(f"Could not fetch database stats: {e}")
-        
-        db_conn.close()
-    else:
-        st.error("❌ Database connection failed")
+    
+    airports = airport_dataset()
+    if 'generation' in airports.attrs:
+        st.write(
+            f"**Dashboard dataset:** generation {airports.attrs['generation']}, "
+            f"{len(airports)} airports, loaded {airports.attrs['loaded_at']:%Y-%m-%d %H:%M:%S}"
+        )
+    
+    st.write("**Connection Pool:**")
+    pool = engine.pool
+    wait_stats = pool_wait_stats()
+    col1, col2, col3, col4, col5 = st.columns(5)
+    with col1:
+        st.metric("Pool Size", pool.size())
+    with col2:
+        st.metric("Checked Out", pool.checkedout())
+    with col3:
+        st.metric("Overflow", max(0, pool.overflow()))
+    with col4:
+        st.metric("Avg Checkout Wait", f"{wait_stats.average_ms():.1f} ms")
+    with col5:
+        st.metric("Max Checkout Wait", f"{1000 * wait_stats.max_wait:.1f} ms")
+    st.caption(pool.status())
     
     st.subheader("System Metrics")
     
+    samples = fetch_flask_metrics()
+    if samples is None:
+        return
+    flask_metrics = summarize_flask_metrics(samples)
+    
+    # Request rate between this and the previous look at the page, or since
+    # the process started on the first one
+    now = time.time()
+    previous = st.session_state.get('flask_metrics_previous')
+    if previous and previous[1] <= flask_metrics['requests_total'] and now > previous[0]:
+        requests_per_minute = 60 * (flask_metrics['requests_total'] - previous[1]) / (now - previous[0])
+    elif flask_metrics['uptime_seconds']:
+        requests_per_minute = 60 * flask_metrics['requests_total'] / flask_metrics['uptime_seconds']
+    else:
+        requests_per_minute = None
+    st.session_state['flask_metrics_previous'] = (now, flask_metrics['requests_total'])
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric("Uptime", "24h 15m")
-        st.metric("Memory Usage", "45%")
+        uptime = flask_metrics['uptime_seconds']
+        st.metric("Uptime", format_duration(uptime) if uptime is not None else "N/A")
+        memory = flask_metrics['memory_bytes']
+        st.metric("Memory (RSS)", f"{memory / 2 ** 20:.0f} MB" if memory is not None else "N/A")
     
     with col2:
-        st.metric("Active Connections", "12")
-        st.metric("Requests/min", "156")
+        st.metric("In-Flight Requests", int(flask_metrics['in_flight']))
+        st.metric("Requests/min", f"{requests_per_minute:.1f}" if requests_per_minute is not None else "N/A")
     
     with col3:
-        st.metric("Error Rate", "0.02%")
-        st.metric("Response Time", "120ms")
+        st.metric("Error Rate", f"{100 * flask_metrics['error_rate']:.2f}%")
+        average = flask_metrics['avg_latency_ms']
+        p95 = flask_metrics['p95_latency_ms']
+        st.metric(
+            "Response Time",
+            f"{average:.1f} ms" if average is not None else "N/A",
+            help=f"p95 ≤ {p95:g} ms" if p95 is not None else None
+        )
+    
+    generation = flask_metrics['snapshot_generation']
+    if generation is not None:
+        st.caption(
+            f"Serving airport data generation {int(generation)}, "
+            f"snapshot built {format_duration(flask_metrics['snapshot_age_seconds'])} ago. "
+            "Figures are for the Flask process that answered this request."
+        )
 
 def show_footer():
     st.markdown("---")
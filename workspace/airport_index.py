@@ -0,0 +1,132 @@
+import numpy as np
+from scipy.spatial import cKDTree
+from geo_distance import HaversineEngine, EARTH_RADIUS_KM
+
+# Relative slack used when collecting near-ties around the nearest chord
+TIE_TOLERANCE = 1e-9
+# Distances equal to this many decimals (in km, i.e. a millimetre) are
+# ties, so the same point written as +180 and -180 longitude resolves to
+# the first row however the last bit of its distance comes out
+RANK_DECIMALS = 6
+
+
+# -------------------------------
+# Unit-sphere helpers
+# -------------------------------
+def to_unit_vectors(lat, lon):
+    # Map latitude/longitude in degrees to 3D points on the unit sphere.
+    # Straight-line (chord) distance between two such points grows
+    # monotonically with the great-circle distance, so a k-d tree over
+    # these vectors returns the same neighbours as a haversine scan.
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    lam = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_phi = np.cos(phi)
+    return np.column_stack((cos_phi * np.cos(lam), cos_phi * np.sin(lam), np.sin(phi)))
+
+
+def pd_to_float(column):
+    # MySQL DECIMAL columns come back from pd.read_sql as Decimal objects
+    return np.asarray(column.astype(float), dtype=np.float64)
+
+
+# -------------------------------
+# Spatial index over df_airports
+# -------------------------------
+class AirportIndex:
+    def __init__(self, df_airports):
+        lats = pd_to_float(df_airports["Latitude"])
+        lons = pd_to_float(df_airports["Longitude"])
+
+        # Airports without coordinates can never be the closest one
+        # (idxmin() skips NaN distances), so leave them out of the tree.
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        if not valid.any():
+            raise ValueError("No airports with valid coordinates to index")
+
+        self.positions = np.flatnonzero(valid)
+        self.lats = np.ascontiguousarray(lats[valid])
+        self.lons = np.ascontiguousarray(lons[valid])
+        self.engine = HaversineEngine(self.lats, self.lons)
+        self.tree = cKDTree(to_unit_vectors(self.lats, self.lons))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def nearest(self, lat, lon):
+        # Returns (row position in df_airports, distance in km)
+        point = to_unit_vectors(lat, lon)[0]
+        chord, _ = self.tree.query(point, k=1)
+
+        # Re-rank every candidate that is (numerically) as close as the
+        # tree's answer with the exact haversine formula, so ties resolve
+        # to the first row exactly like Series.idxmin() does.
+        radius = chord * (1 + TIE_TOLERANCE) + TIE_TOLERANCE
+        candidates = np.sort(self.tree.query_ball_point(point, r=radius))
+        distances = self.engine.distances_from(lat, lon, candidates)
+        best = np.argmin(np.round(distances, RANK_DECIMALS))
+        return int(self.positions[candidates[best]]), float(distances[best])
+
+    def k_nearest(self, lat, lon, k):
+        # The k closest airports, ordered by distance; returns arrays of row
+        # positions in df_airports and distances in km.
+        k = min(k, len(self))
+        point = to_unit_vectors(lat, lon)[0]
+        chords, _ = self.tree.query(point, k=k)
+
+        # Widen the k-th chord slightly so airports tied with the last
+        # result are ranked by the exact formula too.
+        radius = np.atleast_1d(chords)[-1] * (1 + TIE_TOLERANCE) + TIE_TOLERANCE
+        candidates = np.asarray(self.tree.query_ball_point(point, r=radius), dtype=np.intp)
+        positions, distances = self._ranked(lat, lon, candidates)
+        return positions[:k], distances[:k]
+
+    def within_radius(self, lat, lon, radius_km, limit=None):
+        # All airports within radius_km, ordered by distance. The tree only
+        # returns points inside the equivalent chord, so everything further
+        # away is pruned without computing its distance. With a limit, only
+        # the `limit` closest airports are considered, so a radius covering
+        # the whole globe costs no more than k_nearest().
+        if limit is not None:
+            positions, distances = self.k_nearest(lat, lon, limit)
+            keep = distances <= radius_km
+            return positions[keep], distances[keep]
+
+        angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+        chord = 2 * np.sin(angle / 2)
+        point = to_unit_vectors(lat, lon)[0]
+        candidates = np.asarray(
+            self.tree.query_ball_point(point, r=chord * (1 + TIE_TOLERANCE) + TIE_TOLERANCE), dtype=np.intp
+        )
+        positions, distances = self._ranked(lat, lon, candidates)
+        keep = distances <= radius_km
+        return positions[keep], distances[keep]
+
+    def _ranked(self, lat, lon, candidates):
+        # Exact distances for the candidates, sorted by distance and then by
+        # row position so ties keep the table order.
+        distances = self.engine.distances_from(lat, lon, candidates)
+        positions = self.positions[candidates]
+        order = np.lexsort((positions, np.round(distances, RANK_DECIMALS)))
+        return positions[order], distances[order]
+
+    def nearest_many(self, lats, lons):
+        # Vectorized nearest() for a chunk of points; returns arrays of row
+        # positions in df_airports and distances in km.
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        points = to_unit_vectors(lats, lons)
+        k = min(2, len(self))
+        chords, hits = self.tree.query(points, k=k)
+        chords = chords.reshape(len(points), k)
+        hits = hits.reshape(len(points), k)
+
+        positions = self.positions[hits[:, 0]]
+        distances = self.engine.distances_to(lats, lons, hits[:, 0])
+
+        # Points whose runner-up is a near-tie go through the exact
+        # single-point path so both agree on which airport wins.
+        if k > 1:
+            ties = np.flatnonzero(chords[:, 1] <= chords[:, 0] * (1 + TIE_TOLERANCE) + TIE_TOLERANCE)
+            for i in ties:
+                positions[i], distances[i] = self.nearest(lats[i], lons[i])
+        return positions, distances
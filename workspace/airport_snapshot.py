@@ -0,0 +1,55 @@
+import time
+from types import MappingProxyType
+import numpy as np
+import pandas as pd
+from airport_index import AirportIndex
+from nearest_tiles import NearestTiles
+
+AIRPORT_FIELDS = ["AirportCode", "CityCode", "CountryCode", "CountryName", "Latitude", "Longitude"]
+COORDINATE_FIELDS = ["Latitude", "Longitude"]
+
+
+# -------------------------------
+# Immutable airport snapshot
+# -------------------------------
+class AirportSnapshot:
+    # Everything a request handler needs to answer an airport lookup, built
+    # once from df_airports and never modified afterwards. Handlers take a
+    # reference to the current snapshot and only read from it, so any number
+    # of threads can share it without locks. The nearest-airport tiles
+    # (nearest_tiles.py) are derived from it and built on demand.
+    __slots__ = ("records", "index", "generation", "loaded_at", "tiles")
+
+    def __init__(self, df_airports, generation=0):
+        fields = [field for field in AIRPORT_FIELDS if field in df_airports.columns]
+        df_records = df_airports[fields].astype(object)
+        # MySQL returns DECIMAL coordinates and the snapshot file floats, and
+        # missing values come as NaN or None; answers carry plain floats and
+        # None either way
+        for field in COORDINATE_FIELDS:
+            if field in df_records.columns:
+                df_records[field] = pd.to_numeric(df_records[field], errors="coerce").astype(np.float64).astype(object)
+        records = df_records.where(df_records.notna(), None).to_dict("records")
+        index = AirportIndex(df_airports)
+        # The index arrays are shared by every thread, so lock them down too
+        for array in (index.positions, index.lats, index.lons,
+                      index.engine.lat_rad, index.engine.lon_rad, index.engine.cos_lat):
+            array.flags.writeable = False
+
+        object.__setattr__(self, "records", tuple(MappingProxyType(record) for record in records))
+        object.__setattr__(self, "index", index)
+        object.__setattr__(self, "generation", generation)
+        object.__setattr__(self, "loaded_at", time.time())
+        object.__setattr__(self, "tiles", NearestTiles(self))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AirportSnapshot is read-only")
+
+    def __len__(self):
+        return len(self.records)
+
+    def airport(self, position):
+        return self.records[position]
+
+    def airports(self, positions):
+        return [self.records[position] for position in np.asarray(positions).tolist()]
@@ -0,0 +1,127 @@
+from sqlalchemy import text
+
+# -------------------------------
+# Pre-aggregated airport summaries
+# -------------------------------
+# Small tables the dashboard and API read instead of grouping or counting
+# over airports on every request. AirportSync.apply() refreshes them in the
+# same transaction as the sync, so they always describe the committed data.
+CREATE_SUMMARY_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS airport_country_summary (
+        CountryCode VARCHAR(10) PRIMARY KEY,
+        CountryName VARCHAR(100),
+        AirportCount INT NOT NULL,
+        INDEX idx_country_summary_count (AirportCount)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS airport_city_summary (
+        CityCode VARCHAR(10) PRIMARY KEY,
+        CountryCode VARCHAR(10),
+        AirportCount INT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS airport_sync_summary (
+        Dataset VARCHAR(50) PRIMARY KEY,
+        Generation BIGINT NOT NULL,
+        TotalAirports INT NOT NULL,
+        MissingCityCode INT NOT NULL,
+        MissingCountryName INT NOT NULL,
+        MissingCoordinates INT NOT NULL,
+        LastSyncAt TIMESTAMP NULL,
+        LastChangeAt TIMESTAMP NULL,
+        LastInserted INT NOT NULL DEFAULT 0,
+        LastUpdated INT NOT NULL DEFAULT 0,
+        LastDeleted INT NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+
+def ensure_summary_tables(conn):
+    for statement in CREATE_SUMMARY_TABLES:
+        conn.execute(text(statement))
+
+
+def refresh_summaries(conn, generation, run_at, inserted, updated, deleted):
+    # Runs inside the caller's transaction. A run that changed nothing only
+    # moves LastSyncAt, unless the summaries have never been built.
+    changed = inserted or updated or deleted
+    if not changed:
+        result = conn.execute(
+            text("UPDATE airport_sync_summary SET LastSyncAt = :run_at WHERE Dataset = 'airports'"),
+            {"run_at": run_at}
+        )
+        if result.rowcount:
+            return
+
+    # Codes are part of the primary key, so airports without one are
+    # grouped under an empty code
+    conn.execute(text("DELETE FROM airport_country_summary"))
+    conn.execute(text("""
+        INSERT INTO airport_country_summary (CountryCode, CountryName, AirportCount)
+        SELECT COALESCE(CountryCode, ''), MAX(CountryName), COUNT(*)
+        FROM airports
+        GROUP BY COALESCE(CountryCode, '')
+    """))
+    conn.execute(text("DELETE FROM airport_city_summary"))
+    conn.execute(text("""
+        INSERT INTO airport_city_summary (CityCode, CountryCode, AirportCount)
+        SELECT COALESCE(CityCode, ''), MAX(CountryCode), COUNT(*)
+        FROM airports
+        GROUP BY COALESCE(CityCode, '')
+    """))
+    conn.execute(
+        text("""
+            INSERT INTO airport_sync_summary
+                (Dataset, Generation, TotalAirports, MissingCityCode, MissingCountryName, MissingCoordinates,
+                 LastSyncAt, LastChangeAt, LastInserted, LastUpdated, LastDeleted)
+            SELECT 'airports', :generation, COUNT(*),
+                   COALESCE(SUM(CityCode IS NULL OR CityCode = ''), 0),
+                   COALESCE(SUM(CountryName IS NULL OR CountryName = ''), 0),
+                   COALESCE(SUM(Latitude IS NULL OR Longitude IS NULL), 0),
+                   :run_at, :changed_at, :inserted, :updated, :deleted
+            FROM airports
+            ON DUPLICATE KEY UPDATE
+                Generation = VALUES(Generation),
+                TotalAirports = VALUES(TotalAirports),
+                MissingCityCode = VALUES(MissingCityCode),
+                MissingCountryName = VALUES(MissingCountryName),
+                MissingCoordinates = VALUES(MissingCoordinates),
+                LastSyncAt = VALUES(LastSyncAt),
+                LastChangeAt = COALESCE(VALUES(LastChangeAt), LastChangeAt),
+                LastInserted = VALUES(LastInserted),
+                LastUpdated = VALUES(LastUpdated),
+                LastDeleted = VALUES(LastDeleted)
+        """),
+        {
+            "generation": generation,
+            "run_at": run_at,
+            "changed_at": run_at if changed else None,
+            "inserted": inserted,
+            "updated": updated,
+            "deleted": deleted,
+        }
+    )
+
+
+def read_sync_summary(conn):
+    row = conn.execute(
+        text("SELECT * FROM airport_sync_summary WHERE Dataset = 'airports'")
+    ).mappings().first()
+    return dict(row) if row is not None else None
+
+
+def read_top_countries(conn, limit=10):
+    return [
+        dict(row) for row in conn.execute(
+            text("""
+                SELECT CountryCode, CountryName, AirportCount FROM airport_country_summary
+                ORDER BY AirportCount DESC, CountryCode
+                LIMIT :limit
+            """),
+            {"limit": limit}
+        ).mappings()
+    ]
@@ -0,0 +1,318 @@
+import os
+import json
+import hashlib
+import time
+from datetime import datetime, timezone
+import pandas as pd
+from sqlalchemy import bindparam, text
+from data_generation import ensure_generations_table, publish_generation, read_generation
+from airport_summaries import ensure_summary_tables, refresh_summaries
+
+AIRPORT_COLUMNS = ["AirportCode", "CityCode", "CountryCode", "CountryName", "Latitude", "Longitude"]
+# Columns covered by ContentHash; a row whose hash is unchanged is never written
+HASHED_COLUMNS = AIRPORT_COLUMNS[1:]
+COORDINATE_COLUMNS = {"Latitude", "Longitude"}
+STAGING_TABLE = "airports_staging"
+INSERT_BATCH_SIZE = 1000
+# A crawl that stages fewer than this share of the airports already in the
+# table is taken for a broken API answer, not for airports closing
+MIN_STAGED_SHARE = float(os.getenv("AIRPORT_SYNC_MIN_STAGED_SHARE", "0.5"))
+
+CREATE_AIRPORTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS airports (
+        AirportCode VARCHAR(10) PRIMARY KEY,
+        CityCode VARCHAR(10),
+        CountryCode VARCHAR(10),
+        CountryName VARCHAR(100),
+        Latitude DECIMAL(10, 6),
+        Longitude DECIMAL(10, 6),
+        ContentHash CHAR(32),
+        UpdatedAt TIMESTAMP NULL,
+        INDEX idx_airports_city (CityCode),
+        INDEX idx_airports_country_code (CountryCode),
+        INDEX idx_airports_country_name (CountryName)
+    )
+"""
+
+# Secondary indexes behind the dashboard's prefix searches
+AIRPORT_INDEXES = {
+    "idx_airports_city": "CityCode",
+    "idx_airports_country_code": "CountryCode",
+    "idx_airports_country_name": "CountryName",
+}
+
+# One row per import run that changed something, for selective cache invalidation
+CREATE_CHANGE_LOG_TABLE = """
+    CREATE TABLE IF NOT EXISTS airport_change_log (
+        RunId BIGINT AUTO_INCREMENT PRIMARY KEY,
+        Generation BIGINT NOT NULL,
+        RunAt TIMESTAMP NOT NULL,
+        Inserted INT NOT NULL,
+        Updated INT NOT NULL,
+        Deleted INT NOT NULL,
+        InsertedCodes JSON,
+        UpdatedCodes JSON,
+        DeletedCodes JSON
+    )
+"""
+
+
+# -------------------------------
+# Schema preparation
+# -------------------------------
+def ensure_airports_schema(engine):
+    # DDL commits implicitly in MySQL, so it runs before the sync transaction
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_AIRPORTS_TABLE))
+        conn.execute(text(CREATE_CHANGE_LOG_TABLE))
+        ensure_generations_table(conn)
+        ensure_summary_tables(conn)
+
+        # Older tables may be missing columns added since they were created
+        for column, definition in [
+            ("CountryCode", "VARCHAR(10)"),
+            ("ContentHash", "CHAR(32)"),
+            ("UpdatedAt", "TIMESTAMP NULL"),
+        ]:
+            if conn.execute(text(f"SHOW COLUMNS FROM airports LIKE '{column}'")).fetchone() is None:
+                conn.execute(text(f"ALTER TABLE airports ADD COLUMN {column} {definition}"))
+
+        # Tables created by the old to_sql(if_exists="replace") path have no
+        # key, which ON DUPLICATE KEY UPDATE needs
+        if conn.execute(text("SHOW KEYS FROM airports WHERE Key_name = 'PRIMARY'")).fetchone() is None:
+            conn.execute(text(
+                "ALTER TABLE airports MODIFY AirportCode VARCHAR(10) NOT NULL, ADD PRIMARY KEY (AirportCode)"
+            ))
+
+        for index_name, column in AIRPORT_INDEXES.items():
+            if conn.execute(text(f"SHOW INDEX FROM airports WHERE Key_name = '{index_name}'")).fetchone() is None:
+                conn.execute(text(f"CREATE INDEX {index_name} ON airports ({column})"))
+
+
+# -------------------------------
+# Content hashes
+# -------------------------------
+def canonical(value, column):
+    # Same text for a value whether it comes from the API (float) or MySQL
+    # (Decimal), so unchanged rows always hash the same
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "\\N"
+    if column in COORDINATE_COLUMNS:
+        return f"{float(value):.6f}"
+    return str(value)
+
+
+def content_hashes(df):
+    joined = [
+        "|".join(canonical(value, column) for column, value in zip(HASHED_COLUMNS, values))
+        for values in df[HASHED_COLUMNS].itertuples(index=False, name=None)
+    ]
+    return pd.Series([hashlib.md5(row.encode()).hexdigest() for row in joined], index=df.index)
+
+
+# -------------------------------
+# Incremental set-based sync
+# -------------------------------
+def to_rows(df):
+    # One row per AirportCode, with NaN turned into NULL
+    df = df[AIRPORT_COLUMNS].dropna(subset=["AirportCode"]).drop_duplicates("AirportCode", keep="last")
+    df = df.astype(object).where(df.notna(), None)
+    df["ContentHash"] = content_hashes(df)
+    return df.to_dict("records")
+
+
+# Staged rows always carry a hash; rows written before ContentHash existed
+# have none and count as changed
+HASH_CHANGED = "(a.ContentHash IS NULL OR a.ContentHash <> s.ContentHash)"
+
+
+def diff_staging(conn):
+    # Codes to insert, update and delete, from the staging table against
+    # airports. MySQL allows a temporary table only once per statement,
+    # hence the separate queries for each set.
+    inserted = [row[0] for row in conn.execute(text(f"""
+        SELECT s.AirportCode FROM {STAGING_TABLE} s
+        LEFT JOIN airports a ON a.AirportCode = s.AirportCode
+        WHERE a.AirportCode IS NULL
+    """))]
+    updated = [row[0] for row in conn.execute(text(f"""
+        SELECT s.AirportCode FROM {STAGING_TABLE} s
+        JOIN airports a ON a.AirportCode = s.AirportCode
+        WHERE {HASH_CHANGED}
+    """))]
+    deleted = [row[0] for row in conn.execute(text(f"""
+        SELECT a.AirportCode FROM airports a
+        LEFT JOIN {STAGING_TABLE} s ON s.AirportCode = a.AirportCode
+        WHERE s.AirportCode IS NULL
+    """))]
+    return inserted, updated, deleted
+
+
+def delete_airports(conn, codes):
+    # Batched DELETE ... IN, a few round trips instead of one per airport
+    statement = text("DELETE FROM airports WHERE AirportCode IN :codes").bindparams(
+        bindparam("codes", expanding=True)
+    )
+    for start in range(0, len(codes), INSERT_BATCH_SIZE):
+        conn.execute(statement, {"codes": codes[start:start + INSERT_BATCH_SIZE]})
+
+
+class AirportSync:
+    # Streams API rows into a temporary staging table page by page, then
+    # applies the difference to airports in one transaction. Only the
+    # current page is held in Python; the diff against the stored content
+    # hashes happens in MySQL, so memory does not grow with the airport
+    # count. Runs that change something bump the data generation and write
+    # an airport_change_log row; every run refreshes the summary tables in
+    # airport_summaries.py.
+    #
+    #   with AirportSync(engine) as sync:
+    #       for page in pages:
+    #           sync.load(to_rows(page))
+    #       counts = sync.apply()
+    COLUMNS = AIRPORT_COLUMNS + ["ContentHash", "UpdatedAt"]
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.conn = None
+        self.staged = 0
+        self.run_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def __enter__(self):
+        # Temporary tables live as long as this connection, across commits
+        self.conn = self.engine.connect()
+        self.conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}"))
+        self.conn.execute(text(f"CREATE TEMPORARY TABLE {STAGING_TABLE} LIKE airports"))
+        self.conn.commit()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.conn.rollback()
+            self.conn.execute(text(f"DROP TEMPORARY TABLE IF EXISTS {STAGING_TABLE}"))
+            self.conn.commit()
+        finally:
+            self.conn.close()
+            self.conn = None
+
+    def load(self, rows):
+        # Later pages win if the API repeats an AirportCode
+        if not rows:
+            return 0
+        column_list = ", ".join(self.COLUMNS)
+        placeholders = ", ".join(f":{column}" for column in self.COLUMNS)
+        updates = ", ".join(f"{column} = VALUES({column})" for column in self.COLUMNS[1:])
+        for row in rows:
+            row["UpdatedAt"] = self.run_at
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            self.conn.execute(
+                text(f"""
+                    INSERT INTO {STAGING_TABLE} ({column_list}) VALUES ({placeholders})
+                    ON DUPLICATE KEY UPDATE {updates}
+                """),
+                rows[start:start + INSERT_BATCH_SIZE]
+            )
+        self.conn.commit()
+        self.staged += len(rows)
+        return len(rows)
+
+    def apply(self):
+        conn = self.conn
+        column_list = ", ".join(self.COLUMNS)
+        source_columns = ", ".join(f"s.{column}" for column in self.COLUMNS)
+        updates = ", ".join(f"airports.{column} = changed.{column}" for column in self.COLUMNS[1:])
+        # Seconds spent in each step, recorded in import_runs.StageTimings
+        timings = {}
+        lap = StepTimer(timings)
+
+        inserted, updated, deleted = diff_staging(conn)
+        staged_total = conn.execute(text(f"SELECT COUNT(*) FROM {STAGING_TABLE}")).scalar()
+        current_total = conn.execute(text("SELECT COUNT(*) FROM airports")).scalar()
+        lap("diff")
+
+        # Never publish an empty or mostly empty dataset over a good one
+        if staged_total == 0:
+            conn.rollback()
+            raise RuntimeError("Airport sync refused: the API returned no airports")
+        if staged_total < current_total * MIN_STAGED_SHARE:
+            conn.rollback()
+            raise RuntimeError(
+                f"Airport sync refused: {staged_total} API airports for {current_total} in the table "
+                f"(below AIRPORT_SYNC_MIN_STAGED_SHARE={MIN_STAGED_SHARE})"
+            )
+
+        if inserted or updated:
+            # Rows whose hash matches are left untouched
+            conn.execute(text(f"""
+                INSERT INTO airports ({column_list})
+                SELECT * FROM (
+                    SELECT {source_columns} FROM {STAGING_TABLE} s
+                    LEFT JOIN airports a ON a.AirportCode = s.AirportCode
+                    WHERE a.AirportCode IS NULL OR {HASH_CHANGED}
+                ) AS changed
+                ON DUPLICATE KEY UPDATE {updates}
+            """))
+        lap("insert")
+
+        delete_airports(conn, deleted)
+        lap("delete")
+
+        # The table must now hold exactly the API's codes
+        total = conn.execute(text("SELECT COUNT(*) FROM airports")).scalar()
+        if total != staged_total:
+            conn.rollback()
+            raise RuntimeError(f"Airport sync verification failed: {total} rows for {staged_total} API airports")
+        lap("verify")
+
+        changes = {"inserted": inserted, "updated": updated, "deleted": deleted}
+        if inserted or updated or deleted:
+            generation = publish_generation(conn)
+            conn.execute(
+                text("""
+                    INSERT INTO airport_change_log
+                        (Generation, RunAt, Inserted, Updated, Deleted, InsertedCodes, UpdatedCodes, DeletedCodes)
+                    VALUES
+                        (:generation, :run_at, :inserted, :updated, :deleted,
+                         :inserted_codes, :updated_codes, :deleted_codes)
+                """),
+                {
+                    "generation": generation,
+                    "run_at": self.run_at,
+                    "inserted": len(inserted),
+                    "updated": len(updated),
+                    "deleted": len(deleted),
+                    "inserted_codes": json.dumps(inserted),
+                    "updated_codes": json.dumps(updated),
+                    "deleted_codes": json.dumps(deleted),
+                }
+            )
+        else:
+            # Nothing changed: keep the generation so no cache is invalidated
+            generation = read_generation(conn)
+        lap("publish")
+        refresh_summaries(conn, generation, self.run_at, len(inserted), len(updated), len(deleted))
+        lap("summaries")
+        conn.commit()
+        lap("commit")
+
+        return {
+            "inserted": len(inserted),
+            "updated": len(updated),
+            "deleted": len(deleted),
+            "total": total,
+            "generation": generation,
+            "changes": changes,
+            "timings": timings,
+        }
+
+
+class StepTimer:
+    # lap(name) stores the seconds since the previous lap under `name`
+    def __init__(self, timings):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def __call__(self, name):
+        now = time.perf_counter()
+        self.timings[name] = self.timings.get(name, 0.0) + now - self.last
+        self.last = now
@@ -0,0 +1,364 @@
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import httpx
+from sqlalchemy import create_engine, text
+from geo_distance import HaversineEngine, haversine
+from airport_index import AirportIndex
+from airport_sync import AIRPORT_COLUMNS, STAGING_TABLE, content_hashes, delete_airports, diff_staging
+
+# -------------------------------
+# Benchmarks for the lookup and import hot paths
+# -------------------------------
+# Times the original implementations (row-wise haversine apply, isin diff,
+# iterrows delete, sequential page loop) against the current ones on
+# synthetic airport sets, and writes the timings to JSON so two commits
+# can be compared. The original ones are kept here as reference copies;
+# the current ones are the shipped functions, so a regression in them
+# shows up in --compare:
+#
+#   python3 benchmark.py --sizes 1000,10000,100000,1000000 --output tmp/bench-new.json
+#   python3 benchmark.py --compare tmp/bench-old.json --output tmp/bench-new.json
+#   python3 benchmark.py --benchmarks fetch --stub-airports 2400
+#
+# The diff and deletes run against a throwaway SQLite database and the fetch
+# benchmark against stub_lufthansa_server.py, so no MySQL or API credentials
+# are needed.
+
+BENCHMARKS = ["nearest", "diff", "delete", "fetch"]
+
+parser = argparse.ArgumentParser(description="Benchmark nearest-airport lookups and the import sync")
+parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated airport counts")
+parser.add_argument("--benchmarks", default=",".join(BENCHMARKS), help="comma-separated subset of " + ", ".join(BENCHMARKS))
+parser.add_argument("--queries", type=int, default=200, help="lookups timed per implementation and size")
+parser.add_argument("--legacy-queries", type=int, default=3, help="lookups timed for the row-wise apply")
+parser.add_argument("--legacy-max-rows", type=int, default=100000, help="largest size the row-wise apply runs on")
+parser.add_argument("--churn", type=float, default=0.05, help="share of airports added, removed and changed per sync")
+parser.add_argument("--stub-airports", type=int, default=1200)
+parser.add_argument("--stub-latency", type=float, default=0.05)
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--output", default=os.path.join("tmp", "benchmark_results.json"))
+parser.add_argument("--compare", help="earlier results file to compare against")
+args = parser.parse_args()
+
+results = []
+
+
+def record(benchmark, implementation, rows, operations, seconds, **extra):
+    result = {
+        "benchmark": benchmark,
+        "implementation": implementation,
+        "rows": rows,
+        "operations": operations,
+        "seconds": round(seconds, 6),
+        "per_op_ms": round(1000 * seconds / operations, 6) if operations else None,
+        **extra,
+    }
+    results.append(result)
+    print(f"  {benchmark:<8} {implementation:<22} {rows:>9} rows  {operations:>6} ops  "
+          f"{seconds:9.4f}s  {result['per_op_ms'] or 0:10.4f} ms/op")
+
+
+def timed(fn, *fn_args):
+    started = time.perf_counter()
+    value = fn(*fn_args)
+    return value, time.perf_counter() - started
+
+
+def make_airports(count, rng):
+    return pd.DataFrame({
+        "AirportCode": [f"A{i:07d}" for i in range(count)],
+        "CityCode": [f"C{i % max(1, count // 3):06d}" for i in range(count)],
+        "CountryCode": rng.choice(["DE", "FR", "US", "GB", "ES", "IT", "CN", "BR"], count),
+        "CountryName": None,
+        "Latitude": rng.uniform(-90, 90, count).round(6),
+        "Longitude": rng.uniform(-180, 180, count).round(6),
+    })
+
+
+def make_api_snapshot(df_table, rng):
+    # The next API answer: some airports gone, some new, some moved
+    churn = max(1, int(len(df_table) * args.churn))
+    kept = df_table.drop(rng.choice(len(df_table), churn, replace=False)).reset_index(drop=True)
+    moved = rng.choice(len(kept), min(churn, len(kept)), replace=False)
+    kept.loc[moved, "Latitude"] = rng.uniform(-90, 90, len(moved)).round(6)
+    added = make_airports(churn, rng)
+    added["AirportCode"] = [f"N{i:07d}" for i in range(churn)]
+    return pd.concat([kept, added], ignore_index=True)
+
+
+# -------------------------------
+# Nearest airport
+# -------------------------------
+def legacy_nearest(df_airports, lat, lon):
+    # closest_airport() before the spatial index
+    distances = df_airports.apply(lambda row: haversine(lat, lon, row["Latitude"], row["Longitude"]), axis=1)
+    return distances.idxmin()
+
+
+def bench_nearest(df_airports, rng):
+    rows = len(df_airports)
+    lats = rng.uniform(-90, 90, args.queries)
+    lons = rng.uniform(-180, 180, args.queries)
+
+    index, seconds = timed(AirportIndex, df_airports)
+    record("nearest", "index_build", rows, 1, seconds)
+
+    expected = []
+    started = time.perf_counter()
+    for lat, lon in zip(lats, lons):
+        expected.append(index.nearest(lat, lon)[0])
+    record("nearest", "kdtree", rows, args.queries, time.perf_counter() - started)
+
+    _, seconds = timed(index.nearest_many, lats, lons)
+    record("nearest", "kdtree_batch", rows, args.queries, seconds)
+
+    engine = HaversineEngine(df_airports["Latitude"].to_numpy(), df_airports["Longitude"].to_numpy())
+    started = time.perf_counter()
+    mismatches = 0
+    for lat, lon, position in zip(lats, lons, expected):
+        mismatches += int(np.argmin(engine.distances_from(lat, lon))) != position
+    record("nearest", "numpy_haversine", rows, args.queries, time.perf_counter() - started, mismatches=mismatches)
+
+    if rows <= args.legacy_max_rows:
+        count = min(args.legacy_queries, args.queries)
+        started = time.perf_counter()
+        mismatches = 0
+        for lat, lon, position in zip(lats[:count], lons[:count], expected):
+            mismatches += legacy_nearest(df_airports, lat, lon) != position
+        record("nearest", "legacy_apply", rows, count, time.perf_counter() - started, mismatches=mismatches)
+
+
+# -------------------------------
+# Sync diff
+# -------------------------------
+def legacy_diff(df_api, df_table):
+    # airlines_api_call.py before the set-based sync: membership only, so
+    # changed rows were never detected
+    missing_in_table = df_api[~df_api["AirportCode"].isin(df_table["AirportCode"])]
+    missing_in_api = df_table[~df_table["AirportCode"].isin(df_api["AirportCode"])]
+    return len(missing_in_table), 0, len(missing_in_api)
+
+
+def bench_diff(df_table, df_api, engine):
+    # The current diff is airport_sync.diff_staging() on the tables as
+    # AirportSync leaves them before apply(); hashing the API rows, which
+    # the import does page by page, is timed on its own
+    rows = len(df_table)
+    counts, seconds = timed(legacy_diff, df_api, df_table)
+    record("diff", "legacy_isin", rows, 1, seconds, inserted=counts[0], updated=counts[1], deleted=counts[2])
+
+    _, seconds = timed(content_hashes, df_api)
+    record("diff", "content_hashes", rows, len(df_api), seconds)
+
+    fill_table(engine, "airports", df_table)
+    fill_table(engine, STAGING_TABLE, df_api)
+    with engine.connect() as conn:
+        (inserted, updated, deleted), seconds = timed(diff_staging, conn)
+    record("diff", "diff_staging", rows, 1, seconds,
+           inserted=len(inserted), updated=len(updated), deleted=len(deleted))
+
+
+# -------------------------------
+# SQLite stand-in for MySQL
+# -------------------------------
+# The staging table is a plain table under the name AirportSync gives its
+# temporary one, so airport_sync's statements run unchanged
+def fill_table(engine, table, df_airports):
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        conn.execute(text(
+            f"CREATE TABLE {table} (AirportCode VARCHAR(10) PRIMARY KEY, CityCode VARCHAR(10), "
+            "CountryCode VARCHAR(10), CountryName VARCHAR(100), Latitude REAL, Longitude REAL, "
+            "ContentHash CHAR(32))"
+        ))
+    df_airports[AIRPORT_COLUMNS].assign(ContentHash=content_hashes(df_airports)).to_sql(
+        table, engine, if_exists="append", index=False, chunksize=50000
+    )
+
+
+# -------------------------------
+# Deletes (SQLite stand-in)
+# -------------------------------
+
+def legacy_delete(engine, missing_in_api):
+    with engine.begin() as conn:
+        for _, row in missing_in_api.iterrows():
+            conn.execute(text("DELETE FROM airports WHERE AirportCode = :code"), {"code": row["AirportCode"]})
+
+
+def current_delete(engine, missing_in_api):
+    # The delete step of AirportSync.apply()
+    with engine.begin() as conn:
+        delete_airports(conn, missing_in_api["AirportCode"].tolist())
+
+
+def bench_delete(df_table, df_api, engine):
+    rows = len(df_table)
+    missing_in_api = df_table[~df_table["AirportCode"].isin(df_api["AirportCode"])]
+    for name, delete in [("legacy_iterrows", legacy_delete), ("batched_in", current_delete)]:
+        fill_table(engine, "airports", df_table)
+        _, seconds = timed(delete, engine, missing_in_api)
+        with engine.connect() as conn:
+            remaining = conn.execute(text("SELECT COUNT(*) FROM airports")).scalar()
+        record("delete", name, rows, len(missing_in_api), seconds, remaining=remaining)
+
+
+# -------------------------------
+# Paginated fetch (stub API)
+# -------------------------------
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub(port):
+    stub = subprocess.Popen(
+        [sys.executable, "stub_lufthansa_server.py", "--port", str(port),
+         "--airports", str(args.stub_airports), "--latency", str(args.stub_latency), "--seed", str(args.seed)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return stub
+        except OSError:
+            time.sleep(0.05)
+    stub.terminate()
+    raise RuntimeError("Stub Lufthansa server did not start")
+
+
+def legacy_fetch(base_url):
+    # The original loop: one page at a time, a new connection per request
+    # and a fixed half-second pause between pages
+    response = httpx.post(f"{base_url}/v1/oauth/token", data={
+        "client_id": "benchmark", "client_secret": "benchmark", "grant_type": "client_credentials"
+    })
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    airports, offset, limit = [], 0, 100
+    while True:
+        response = httpx.get(f"{base_url}/v1/references/airports", headers=headers,
+                             params={"limit": limit, "offset": offset})
+        if response.status_code == 404:
+            break
+        response.raise_for_status()
+        page = response.json().get("AirportResource", {}).get("Airports", {}).get("Airport", [])
+        if not page:
+            break
+        airports.extend(page if isinstance(page, list) else [page])
+        if len(page) < limit:
+            break
+        offset += limit
+        time.sleep(0.5)
+    return len(airports)
+
+
+def current_fetch(base_url, directory):
+    from lufthansa_client import LufthansaClient, PageFetcher
+    api = LufthansaClient("benchmark", "benchmark", base_url=base_url,
+                          cache_path=os.path.join(directory, "token.json"))
+    try:
+        airports = PageFetcher(api).fetch_all(
+            "/v1/references/airports",
+            items_path=("AirportResource", "Airports", "Airport"),
+            total_path=("AirportResource", "Meta", "TotalCount")
+        )
+    finally:
+        api.close()
+    return len(airports)
+
+
+def bench_fetch(directory):
+    port = free_port()
+    stub = start_stub(port)
+    base_url = f"http://127.0.0.1:{port}"
+    pages = -(-args.stub_airports // 100)
+    try:
+        count, seconds = timed(legacy_fetch, base_url)
+        record("fetch", "legacy_sequential", count, pages, seconds)
+        count, seconds = timed(current_fetch, base_url, directory)
+        record("fetch", "page_fetcher", count, pages, seconds)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+# -------------------------------
+# Run and report
+# -------------------------------
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous_path):
+    with open(previous_path) as f:
+        previous = {
+            (r["benchmark"], r["implementation"], r["rows"]): r for r in json.load(f)["results"]
+        }
+    print(f"\nCompared with {previous_path} (ratio > 1 means slower now):")
+    for result in results:
+        before = previous.get((result["benchmark"], result["implementation"], result["rows"]))
+        if before and before.get("per_op_ms") and result["per_op_ms"] is not None:
+            ratio = result["per_op_ms"] / before["per_op_ms"]
+            flag = "  <-- slower" if ratio > 1.2 else ""
+            print(f"  {result['benchmark']:<8} {result['implementation']:<22} {result['rows']:>9} rows  x{ratio:6.2f}{flag}")
+
+
+selected = [name.strip() for name in args.benchmarks.split(",") if name.strip()]
+unknown = set(selected) - set(BENCHMARKS)
+if unknown:
+    parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+rng = np.random.default_rng(args.seed)
+
+with tempfile.TemporaryDirectory() as directory:
+    sqlite_engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+    for size in sizes:
+        if not {"nearest", "diff", "delete"} & set(selected):
+            break
+        print(f"{size} airports")
+        df_table = make_airports(size, rng)
+        df_api = make_api_snapshot(df_table, rng)
+        if "nearest" in selected:
+            bench_nearest(df_table, rng)
+        if "diff" in selected:
+            bench_diff(df_table, df_api, sqlite_engine)
+        if "delete" in selected:
+            bench_delete(df_table, df_api, sqlite_engine)
+    sqlite_engine.dispose()
+
+    if "fetch" in selected:
+        print(f"{args.stub_airports} airports from the stub API")
+        bench_fetch(directory)
+
+output = {
+    "commit": git_commit(),
+    "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    "python": platform.python_version(),
+    "machine": platform.machine(),
+    "settings": vars(args),
+    "results": results,
+}
+os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+with open(args.output, "w") as f:
+    json.dump(output, f, indent=2, default=int)
+print(f"\nWrote {len(results)} results to {args.output}")
+
+if args.compare:
+    compare(args.compare)
@@ -0,0 +1,61 @@
+from sqlalchemy import text
+
+# -------------------------------
+# Country code -> name lookup
+# -------------------------------
+# Built once per run and applied with a vectorized Series.map instead of
+# one pycountry call per airport. The table is persisted in MySQL, so a
+# run that finds it filled never imports pycountry at all.
+CREATE_COUNTRY_NAMES_TABLE = """
+    CREATE TABLE IF NOT EXISTS country_names (
+        CountryCode VARCHAR(10) PRIMARY KEY,
+        CountryName VARCHAR(100) NOT NULL
+    )
+"""
+
+
+def pycountry_lookup():
+    # Imported here so runs served from MySQL skip pycountry's start-up cost
+    import pycountry
+    return {country.alpha_2: country.name for country in pycountry.countries}
+
+
+class CountryNames:
+    def __init__(self, engine=None, lazy=True):
+        self.engine = engine
+        self._lookup = None
+        # Codes seen in the data with no known name, reported once per run
+        self.unknown = set()
+        if not lazy:
+            self.lookup()
+
+    def lookup(self):
+        if self._lookup is None:
+            self._lookup = self._load_persisted() or self._build_and_persist()
+        return self._lookup
+
+    def enrich(self, df, code_column="CountryCode", name_column="CountryName"):
+        # A column of only missing codes (or non-string ones) has no .str
+        codes = df[code_column].astype("string").str.upper()
+        df[name_column] = codes.map(self.lookup())
+        missing = codes[codes.notna() & df[name_column].isna()]
+        self.unknown.update(missing.unique())
+        return df
+
+    def _load_persisted(self):
+        if self.engine is None:
+            return None
+        with self.engine.begin() as conn:
+            conn.execute(text(CREATE_COUNTRY_NAMES_TABLE))
+            rows = conn.execute(text("SELECT CountryCode, CountryName FROM country_names")).fetchall()
+        return dict(rows) if rows else None
+
+    def _build_and_persist(self):
+        lookup = pycountry_lookup()
+        if self.engine is not None:
+            with self.engine.begin() as conn:
+                conn.execute(
+                    text("INSERT IGNORE INTO country_names (CountryCode, CountryName) VALUES (:code, :name)"),
+                    [{"code": code, "name": name} for code, name in lookup.items()]
+                )
+        return lookup
@@ -0,0 +1,44 @@
+from sqlalchemy import text
+
+# -------------------------------
+# Data generation markers
+# -------------------------------
+# Every successful import bumps a per-dataset generation counter in MySQL.
+# Serving processes compare it with the generation of the data they hold
+# and rebuild their in-memory copies when it moves.
+AIRPORTS_DATASET = "airports"
+
+CREATE_GENERATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS data_generations (
+        Dataset VARCHAR(50) PRIMARY KEY,
+        Generation BIGINT NOT NULL DEFAULT 0,
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+
+def ensure_generations_table(conn):
+    conn.execute(text(CREATE_GENERATIONS_TABLE))
+
+
+def read_generation(conn, dataset=AIRPORTS_DATASET):
+    # Generation 0 means nothing has been published yet
+    result = conn.execute(
+        text("SELECT Generation FROM data_generations WHERE Dataset = :dataset"),
+        {"dataset": dataset}
+    )
+    generation = result.scalar()
+    return int(generation) if generation is not None else 0
+
+
+def publish_generation(conn, dataset=AIRPORTS_DATASET):
+    # Call inside the transaction that wrote the data so readers never see
+    # the new generation before the new rows
+    conn.execute(
+        text("""
+            INSERT INTO data_generations (Dataset, Generation) VALUES (:dataset, 1)
+            ON DUPLICATE KEY UPDATE Generation = Generation + 1
+        """),
+        {"dataset": dataset}
+    )
+    return read_generation(conn, dataset)
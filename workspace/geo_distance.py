@@ -0,0 +1,81 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371  # Earth radius in km
+
+# Upper bound on the distances distances_from_many() holds at once
+# (4M float64 values, 32 MB)
+MAX_MATRIX_CELLS = 4_000_000
+
+
+# -------------------------------
+# Scalar reference formula
+# -------------------------------
+def haversine(lat1, lon1, lat2, lon2):
+    R = EARTH_RADIUS_KM
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+
+    a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+# -------------------------------
+# Vectorized haversine engine
+# -------------------------------
+class HaversineEngine:
+    # Keeps the airport coordinates as contiguous float64 arrays in radians,
+    # together with cos(lat), so every query is a single NumPy pass with no
+    # per-airport trigonometry left to redo.
+    def __init__(self, lats, lons):
+        self.lat_rad = np.ascontiguousarray(np.radians(np.asarray(lats, dtype=np.float64)))
+        self.lon_rad = np.ascontiguousarray(np.radians(np.asarray(lons, dtype=np.float64)))
+        self.cos_lat = np.ascontiguousarray(np.cos(self.lat_rad))
+
+    def __len__(self):
+        return len(self.lat_rad)
+
+    def distances_from(self, lat, lon, subset=None):
+        # Distances in km from one point to every airport, or only to the
+        # airports at the positions given in `subset`.
+        lat_rad = self.lat_rad if subset is None else self.lat_rad[subset]
+        lon_rad = self.lon_rad if subset is None else self.lon_rad[subset]
+        cos_lat = self.cos_lat if subset is None else self.cos_lat[subset]
+
+        phi = math.radians(lat)
+        return _central_angle(
+            lat_rad - phi, lon_rad - math.radians(lon), math.cos(phi), cos_lat
+        ) * EARTH_RADIUS_KM
+
+    def distances_to(self, lats, lons, positions):
+        # Element-wise distances in km from each point to the airport at the
+        # matching position, e.g. to score a batch of nearest-neighbour hits.
+        phi = np.radians(np.asarray(lats, dtype=np.float64))
+        lam = np.radians(np.asarray(lons, dtype=np.float64))
+        return _central_angle(
+            self.lat_rad[positions] - phi, self.lon_rad[positions] - lam, np.cos(phi), self.cos_lat[positions]
+        ) * EARTH_RADIUS_KM
+
+    def distances_from_many(self, lats, lons, max_cells=MAX_MATRIX_CELLS):
+        # Distances in km from many points to every airport. Yields (start,
+        # matrix) pairs, where matrix has shape (rows, len(self)) and holds
+        # the points start .. start + rows, each computed in one NumPy pass.
+        # Rows are chosen so a chunk never exceeds max_cells distances.
+        phi = np.radians(np.asarray(lats, dtype=np.float64))
+        lam = np.radians(np.asarray(lons, dtype=np.float64))
+        rows = max(1, max_cells // max(1, len(self)))
+        for start in range(0, len(phi), rows):
+            chunk_phi = phi[start:start + rows, np.newaxis]
+            chunk_lam = lam[start:start + rows, np.newaxis]
+            yield start, _central_angle(
+                self.lat_rad - chunk_phi, self.lon_rad - chunk_lam, np.cos(chunk_phi), self.cos_lat
+            ) * EARTH_RADIUS_KM
+
+
+def _central_angle(dphi, dlambda, cos_phi1, cos_phi2):
+    a = np.sin(dphi / 2) ** 2 + cos_phi1 * cos_phi2 * np.sin(dlambda / 2) ** 2
+    a = np.clip(a, 0.0, 1.0)
+    return 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
@@ -0,0 +1,38 @@
+import gc
+import os
+
+# -------------------------------
+# Production WSGI settings for user_input.py
+# -------------------------------
+#   gunicorn -c gunicorn.conf.py wsgi:app
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5000')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+
+# Import user_input (and so load the airport snapshot) once in the master.
+# Forked workers then share the snapshot's NumPy arrays copy-on-write
+# instead of each loading its own copy from MySQL.
+preload_app = True
+
+# Imports run as background jobs, so only long batch lookups need headroom
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    # The master's pooled MySQL connections were inherited by the fork;
+    # drop them without closing so this worker opens its own sockets
+    import user_input
+    if user_input.engine is not None:
+        user_input.engine.dispose(close=False)
+    # Each worker polls for new airport data generations on its own thread
+    user_input.start_snapshot_refresher()
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the permanent GC generation so the
+    # collector in each worker never writes to (and so copies) those pages
+    gc.freeze()
@@ -0,0 +1,201 @@
+import os
+import re
+import subprocess
+import threading
+import time
+import uuid
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# Background import jobs
+# -------------------------------
+# /run_data_import only records a job and returns its id; the crawl runs
+# in a subprocess on a background thread. Job state lives in MySQL so any
+# Flask worker can report on a job and duplicate triggers are coalesced
+# across workers, not just within one process.
+CREATE_IMPORT_JOBS_TABLE = """
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        JobId VARCHAR(36) PRIMARY KEY,
+        Status VARCHAR(20) NOT NULL,
+        CreatedAt DOUBLE NOT NULL,
+        StartedAt DOUBLE NULL,
+        FinishedAt DOUBLE NULL,
+        UpdatedAt DOUBLE NOT NULL,
+        PagesFetched INT NOT NULL DEFAULT 0,
+        RowsUpserted INT NOT NULL DEFAULT 0,
+        RowsDeleted INT NOT NULL DEFAULT 0,
+        Output MEDIUMTEXT,
+        Error TEXT,
+        INDEX idx_import_jobs_status (Status)
+    )
+"""
+
+# The importer reports progress by printing lines like "PROGRESS pages_fetched=3"
+PROGRESS_PATTERN = re.compile(r"^PROGRESS (\w+)=(\d+)\s*$")
+PROGRESS_COLUMNS = {
+    "pages_fetched": "PagesFetched",
+    "rows_upserted": "RowsUpserted",
+    "rows_deleted": "RowsDeleted",
+}
+
+# A job that has not reported anything for this long is assumed to have
+# died with its worker and no longer blocks new imports
+JOB_STALE_SECONDS = 1800
+MAX_OUTPUT_CHARS = 65536
+SUBMIT_LOCK_TIMEOUT = 10
+
+
+class ImportQueueBusy(RuntimeError):
+    # Another worker held the submit lock for SUBMIT_LOCK_TIMEOUT seconds
+    pass
+
+
+class ImportJobQueue:
+    def __init__(self, engine, command, on_success=None, on_finish=None):
+        # on_finish(status, seconds) is called for every job this process ran
+        self.engine = engine
+        self.command = command
+        self.on_success = on_success
+        self.on_finish = on_finish
+        with self.engine.begin() as conn:
+            conn.execute(text(CREATE_IMPORT_JOBS_TABLE))
+
+    def submit(self):
+        # Returns (job, created). While an import is queued or running the
+        # existing job is returned instead of starting a second crawl.
+        now = time.time()
+        with self.engine.begin() as conn:
+            # Serialize the check-then-insert between workers. GET_LOCK returns
+            # 0 on timeout and NULL on error; without the lock two workers
+            # could both start a crawl.
+            locked = conn.execute(
+                text("SELECT GET_LOCK('import_jobs_submit', :timeout)"), {"timeout": SUBMIT_LOCK_TIMEOUT}
+            ).scalar()
+            if locked != 1:
+                raise ImportQueueBusy("Could not get the import_jobs_submit lock")
+            try:
+                conn.execute(
+                    text("""
+                        UPDATE import_jobs SET Status = 'failed', Error = 'Job went stale', FinishedAt = :now
+                        WHERE Status IN ('queued', 'running') AND UpdatedAt < :cutoff
+                    """),
+                    {"now": now, "cutoff": now - JOB_STALE_SECONDS}
+                )
+                active = conn.execute(
+                    text("""
+                        SELECT * FROM import_jobs WHERE Status IN ('queued', 'running')
+                        ORDER BY CreatedAt LIMIT 1
+                    """)
+                ).mappings().first()
+                if active is not None:
+                    return job_to_dict(active), False
+
+                job_id = str(uuid.uuid4())
+                conn.execute(
+                    text("""
+                        INSERT INTO import_jobs (JobId, Status, CreatedAt, UpdatedAt)
+                        VALUES (:job_id, 'queued', :now, :now)
+                    """),
+                    {"job_id": job_id, "now": now}
+                )
+            finally:
+                conn.execute(text("SELECT RELEASE_LOCK('import_jobs_submit')"))
+
+        threading.Thread(target=self._run, args=(job_id,), name=f"import-{job_id}", daemon=True).start()
+        return self.get(job_id), True
+
+    def get(self, job_id):
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT * FROM import_jobs WHERE JobId = :job_id"), {"job_id": job_id}
+            ).mappings().first()
+        return job_to_dict(row) if row is not None else None
+
+    def _update(self, job_id, **columns):
+        columns["UpdatedAt"] = time.time()
+        assignments = ", ".join(f"{column} = :{column}" for column in columns)
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"UPDATE import_jobs SET {assignments} WHERE JobId = :job_id"),
+                {"job_id": job_id, **columns}
+            )
+
+    def _run(self, job_id):
+        started = time.time()
+        self._update(job_id, Status="running", StartedAt=started)
+        status = "failed"
+        try:
+            status = self._execute(job_id)
+        finally:
+            if self.on_finish:
+                self.on_finish(status, time.time() - started)
+
+    def _execute(self, job_id):
+        # Runs the import command and returns the job's final status
+        output = []
+        try:
+            # The importer records its import_runs row under this job id
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                env={**os.environ, "IMPORT_JOB_ID": job_id}
+            )
+            for line in process.stdout:
+                output.append(line)
+                match = PROGRESS_PATTERN.match(line)
+                if match and match.group(1) in PROGRESS_COLUMNS:
+                    self._update(
+                        job_id,
+                        **{PROGRESS_COLUMNS[match.group(1)]: int(match.group(2))},
+                        Output=tail(output)
+                    )
+            returncode = process.wait()
+        except Exception as e:
+            logger.error(f"Import job {job_id} could not run: {e}")
+            self._update(job_id, Status="failed", FinishedAt=time.time(), Output=tail(output), Error=str(e))
+            return "failed"
+
+        if returncode != 0:
+            logger.error(f"Import job {job_id} failed with exit code {returncode}")
+            self._update(
+                job_id, Status="failed", FinishedAt=time.time(), Output=tail(output),
+                Error=f"Script execution failed with exit code {returncode}"
+            )
+            return "failed"
+
+        self._update(job_id, Status="succeeded", FinishedAt=time.time(), Output=tail(output))
+        logger.info(f"Import job {job_id} finished")
+        if self.on_success:
+            self.on_success()
+        return "succeeded"
+
+
+def tail(lines):
+    return "".join(lines)[-MAX_OUTPUT_CHARS:]
+
+
+def job_to_dict(row):
+    started = row["StartedAt"]
+    finished = row["FinishedAt"]
+    if started is None:
+        duration = None
+    else:
+        duration = round((finished if finished is not None else time.time()) - started, 3)
+    return {
+        "job_id": row["JobId"],
+        "status": row["Status"],
+        "created_at": row["CreatedAt"],
+        "started_at": started,
+        "finished_at": finished,
+        "duration_seconds": duration,
+        "pages_fetched": row["PagesFetched"],
+        "rows_upserted": row["RowsUpserted"],
+        "rows_deleted": row["RowsDeleted"],
+        "output": row["Output"],
+        "error": row["Error"],
+    }
@@ -0,0 +1,88 @@
+import time
+import pandas as pd
+from airport_sync import to_rows
+
+# -------------------------------
+# Streaming airports ETL
+# -------------------------------
+# fetch -> flatten -> enrich -> load, one page at a time. The fetcher keeps
+# requesting the next pages in the background while the current one is
+# flattened and written to staging, so loading overlaps with fetching and
+# only a handful of pages are ever held in memory.
+STAGES = ["fetch", "flatten", "enrich", "load"]
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.seconds = 0.0
+
+    def add(self, items, seconds):
+        self.items += items
+        self.seconds += seconds
+
+    @property
+    def throughput(self):
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return f"{self.name:<8} {self.items:>8} rows  {self.seconds:8.3f}s  {self.throughput:10.1f} rows/s"
+
+
+# -------------------------------
+# Stages
+# -------------------------------
+def flatten_airports(airports):
+    records = []
+    for airport in airports:
+        coord = airport.get("Position", {}).get("Coordinate", {})
+        records.append({
+            "AirportCode": airport.get("AirportCode"),
+            "CityCode": airport.get("CityCode"),
+            "CountryCode": airport.get("CountryCode"),
+            "Latitude": coord.get("Latitude"),
+            "Longitude": coord.get("Longitude")
+        })
+    return pd.DataFrame(records, columns=["AirportCode", "CityCode", "CountryCode", "Latitude", "Longitude"])
+
+
+def enrich_airports(df, countries):
+    # `countries` is a CountryNames lookup built once per run
+    return countries.enrich(df)
+
+
+# -------------------------------
+# Pipeline driver
+# -------------------------------
+def run_airport_pipeline(pages, sync, countries, on_page=None):
+    # `pages` yields (offset, raw airports), `sync` is an open AirportSync
+    # and `countries` a CountryNames lookup; returns per-stage StageStats
+    # keyed by stage name
+    stats = {name: StageStats(name) for name in STAGES}
+    pages = iter(pages)
+
+    while True:
+        started = time.perf_counter()
+        try:
+            offset, airports = next(pages)
+        except StopIteration:
+            break
+        stats["fetch"].add(len(airports), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        df = flatten_airports(airports)
+        stats["flatten"].add(len(df), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        df = enrich_airports(df, countries)
+        stats["enrich"].add(len(df), time.perf_counter() - started)
+
+        started = time.perf_counter()
+        loaded = sync.load(to_rows(df))
+        stats["load"].add(loaded, time.perf_counter() - started)
+
+        if on_page:
+            on_page(offset, airports)
+
+    return stats
@@ -0,0 +1,149 @@
+import io
+import os
+import json
+import time
+import pstats
+import cProfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from sqlalchemy import text
+
+# -------------------------------
+# Import run history
+# -------------------------------
+# One import_runs row per airlines_api_call.py run with the time spent in
+# each stage (auth, page fetches, rate-limit and backoff waits, flatten,
+# country enrichment, staging load, diff, insert, delete, verify, ...),
+# the row counts and the bytes received. Runs started from
+# /run_data_import carry the JobId of their import job.
+CREATE_IMPORT_RUNS_TABLE = """
+    CREATE TABLE IF NOT EXISTS import_runs (
+        RunId BIGINT AUTO_INCREMENT PRIMARY KEY,
+        JobId VARCHAR(36) NULL,
+        Status VARCHAR(20) NOT NULL,
+        StartedAt TIMESTAMP NOT NULL,
+        FinishedAt TIMESTAMP NOT NULL,
+        TotalSeconds DOUBLE NOT NULL,
+        Pages INT NOT NULL DEFAULT 0,
+        AirportsFetched INT NOT NULL DEFAULT 0,
+        RowsInserted INT NOT NULL DEFAULT 0,
+        RowsUpdated INT NOT NULL DEFAULT 0,
+        RowsDeleted INT NOT NULL DEFAULT 0,
+        BytesReceived BIGINT NOT NULL DEFAULT 0,
+        TokensRequested INT NOT NULL DEFAULT 0,
+        Generation BIGINT NULL,
+        StageTimings JSON,
+        PageTimings JSON,
+        Profile MEDIUMTEXT,
+        Error TEXT,
+        INDEX idx_import_runs_job (JobId),
+        INDEX idx_import_runs_started (StartedAt)
+    )
+"""
+
+# Optional cProfile output: a .prof file per run for snakeviz/pstats, and
+# the top functions by cumulative time in import_runs.Profile
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tmp", "profiles")
+PROFILE_TOP_FUNCTIONS = 40
+
+TOTAL_COLUMNS = [
+    "Pages", "AirportsFetched", "RowsInserted", "RowsUpdated", "RowsDeleted",
+    "BytesReceived", "TokensRequested", "Generation",
+]
+
+
+class ImportRun:
+    def __init__(self, job_id=None, profile=False):
+        self.job_id = job_id
+        self.started_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.started = time.perf_counter()
+        # stage name -> {"seconds", "count", "rows"}, in the order first seen
+        self.stages = {}
+        self.page_timings = []
+        self.totals = {}
+        self.lock = threading.Lock()
+        self.profiler = cProfile.Profile() if profile else None
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - started, rows=rows)
+
+    def add_stage(self, name, seconds, rows=None, count=1):
+        with self.lock:
+            stage = self.stages.setdefault(name, {"seconds": 0.0, "count": 0, "rows": 0})
+            stage["seconds"] += seconds
+            stage["count"] += count
+            if rows:
+                stage["rows"] += rows
+
+    def summary_lines(self):
+        total = time.perf_counter() - self.started
+        lines = []
+        for name, stage in self.stages.items():
+            share = 100 * stage["seconds"] / total if total else 0.0
+            lines.append(
+                f"{name:<16} {stage['seconds']:9.3f}s {share:5.1f}%  x{stage['count']:<5} {stage['rows']:>8} rows"
+            )
+        return lines
+
+    def save(self, engine, status, error=None):
+        profile = self._finish_profile()
+        finished_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        row = {column: self.totals.get(column, 0) for column in TOTAL_COLUMNS}
+        row["Generation"] = self.totals.get("Generation")
+        row.update({
+            "JobId": self.job_id,
+            "Status": status,
+            "StartedAt": self.started_at,
+            "FinishedAt": finished_at,
+            "TotalSeconds": round(time.perf_counter() - self.started, 6),
+            "StageTimings": json.dumps({
+                name: {**stage, "seconds": round(stage["seconds"], 6)} for name, stage in self.stages.items()
+            }),
+            "PageTimings": json.dumps(self.page_timings),
+            "Profile": profile,
+            "Error": error,
+        })
+        columns = ", ".join(row)
+        placeholders = ", ".join(f":{column}" for column in row)
+        with engine.begin() as conn:
+            conn.execute(text(CREATE_IMPORT_RUNS_TABLE))
+            result = conn.execute(text(f"INSERT INTO import_runs ({columns}) VALUES ({placeholders})"), row)
+        return result.lastrowid
+
+    def _finish_profile(self):
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"import-{self.started_at:%Y%m%dT%H%M%S}.prof")
+        self.profiler.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(self.profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP_FUNCTIONS)
+        return f"{path}\n{output.getvalue()}"
+
+
+def read_import_run(conn, job_id):
+    # Latest run recorded for an import job, with its JSON columns decoded
+    row = conn.execute(
+        text("""
+            SELECT RunId, Status, StartedAt, FinishedAt, TotalSeconds, Pages, AirportsFetched,
+                   RowsInserted, RowsUpdated, RowsDeleted, BytesReceived, TokensRequested,
+                   Generation, StageTimings
+            FROM import_runs WHERE JobId = :job_id ORDER BY RunId DESC LIMIT 1
+        """),
+        {"job_id": job_id}
+    ).mappings().first()
+    if row is None:
+        return None
+    run = dict(row)
+    if isinstance(run["StageTimings"], str):
+        run["StageTimings"] = json.loads(run["StageTimings"])
+    return run
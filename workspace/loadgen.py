@@ -0,0 +1,51 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# -------------------------------
+# Concurrent load test for /closest_airport
+# -------------------------------
+# Fires the same number of lookups with 1, 2, 4, ... client threads and
+# prints the throughput for each, so the speedup of a threaded or
+# multi-worker Flask deployment can be compared against a single thread.
+#
+#   python3 loadgen.py --url http://localhost:5001 --requests 2000 --max-threads 8
+
+parser = argparse.ArgumentParser(description="Measure /closest_airport throughput per thread count")
+parser.add_argument("--url", default="http://localhost:5000")
+parser.add_argument("--requests", type=int, default=1000)
+parser.add_argument("--max-threads", type=int, default=8)
+args = parser.parse_args()
+
+local = threading.local()
+
+
+def lookup(_):
+    # One keep-alive session per client thread
+    if not hasattr(local, "session"):
+        local.session = requests.Session()
+    response = local.session.post(
+        f"{args.url}/closest_airport",
+        json={"latitude": random.uniform(-90, 90), "longitude": random.uniform(-180, 180)},
+        timeout=10,
+    )
+    response.raise_for_status()
+
+
+def run(threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lookup, range(args.requests)))
+    return args.requests / (time.perf_counter() - start)
+
+
+threads = 1
+baseline = None
+while threads <= args.max_threads:
+    throughput = run(threads)
+    baseline = baseline or throughput
+    print(f"{threads:>3} threads: {throughput:8.1f} req/s  (speedup x{throughput / baseline:.2f})")
+    threads *= 2
@@ -0,0 +1,309 @@
+import os
+import json
+import math
+import time
+import random
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+
+# -------------------------------
+# Lufthansa API settings
+# -------------------------------
+# LUFTHANSA_BASE_URL can point at stub_lufthansa_server.py for local runs
+LUFTHANSA_BASE_URL = os.getenv("LUFTHANSA_BASE_URL", "https://api.lufthansa.com").rstrip("/")
+# The public plan allows 5 calls per second
+RATE_LIMIT_PER_SECOND = float(os.getenv("LUFTHANSA_RATE_LIMIT", "5"))
+MAX_CONCURRENT_PAGES = int(os.getenv("LUFTHANSA_CONCURRENCY", "4"))
+PAGE_LIMIT = 100
+MAX_RETRIES = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Access tokens are cached on disk between cron runs and renewed this many
+# seconds before the expires_in the token endpoint reported, or halfway
+# through the lifetime of tokens shorter than twice the margin
+TOKEN_CACHE_PATH = os.getenv(
+    "LUFTHANSA_TOKEN_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tmp", "lufthansa_token.json")
+)
+TOKEN_EXPIRY_MARGIN = 300
+
+
+def create_http_client(max_connections=MAX_CONCURRENT_PAGES):
+    # One pooled client per run; connections are reused for every page
+    return httpx.Client(
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+
+
+def get_access_token(client, client_id, client_secret, base_url=LUFTHANSA_BASE_URL):
+    response = client.post(
+        f"{base_url}/v1/oauth/token",
+        data={
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": "client_credentials"
+        }
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+# -------------------------------
+# Authenticated API client
+# -------------------------------
+class LufthansaClient:
+    # Wraps one keep-alive httpx client and the OAuth token. The token is
+    # reused (in memory and from TOKEN_CACHE_PATH) until shortly before it
+    # expires, and a 401 answer renews it once and replays the request.
+    def __init__(self, client_id, client_secret, base_url=LUFTHANSA_BASE_URL,
+                 cache_path=TOKEN_CACHE_PATH, http_client=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.base_url = base_url
+        self.cache_path = cache_path
+        self.http = http_client or create_http_client()
+        self.token = None
+        self.expires_at = 0.0
+        self.token_lock = threading.Lock()
+        self.tokens_requested = 0
+        self._load_cached_token()
+
+    def access_token(self):
+        with self.token_lock:
+            if self.token is None or time.time() >= self.expires_at:
+                self._request_token()
+            return self.token
+
+    def get(self, path_or_url, params=None):
+        url = path_or_url if path_or_url.startswith("http") else f"{self.base_url}{path_or_url}"
+        token = self.access_token()
+        response = self.http.get(url, headers={"Authorization": f"Bearer {token}"}, params=params)
+        if response.status_code == 401:
+            self._renew_token(token)
+            response = self.http.get(
+                url, headers={"Authorization": f"Bearer {self.access_token()}"}, params=params
+            )
+        return response
+
+    def close(self):
+        self.http.close()
+
+    def _renew_token(self, rejected_token):
+        # Only the first thread that saw the rejected token fetches a new one
+        with self.token_lock:
+            if self.token == rejected_token:
+                self._request_token()
+
+    def _request_token(self):
+        json_response = get_access_token(self.http, self.client_id, self.client_secret, self.base_url)
+        self.tokens_requested += 1
+        self.token = json_response["access_token"]
+        expires_in = float(json_response.get("expires_in", 0))
+        margin = min(TOKEN_EXPIRY_MARGIN, expires_in / 2)
+        self.expires_at = time.time() + max(0.0, expires_in - margin)
+        self._save_cached_token()
+
+    def _load_cached_token(self):
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        # A token is only valid for the account and API it was issued by
+        if cached.get("client_id") != self.client_id or cached.get("base_url") != self.base_url:
+            return
+        if time.time() < cached.get("expires_at", 0):
+            self.token = cached.get("access_token")
+            self.expires_at = cached["expires_at"]
+
+    def _save_cached_token(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                json.dump({
+                    "client_id": self.client_id,
+                    "base_url": self.base_url,
+                    "access_token": self.token,
+                    "expires_at": self.expires_at
+                }, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            # The cache only saves a round trip; never fail the import over it
+            pass
+
+
+# -------------------------------
+# Token-bucket rate limiter
+# -------------------------------
+class TokenBucket:
+    # Allows bursts of up to `capacity` calls and `rate` calls per second on
+    # average, shared by every thread that calls acquire()
+    def __init__(self, rate=RATE_LIMIT_PER_SECOND, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# -------------------------------
+# Concurrent paginated fetcher
+# -------------------------------
+def dig(data, path):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def as_list(items):
+    # The API returns a bare object instead of a list when a page has one item
+    if items is None:
+        return []
+    return items if isinstance(items, list) else [items]
+
+
+class PageFetcher:
+    def __init__(self, api, rate_limiter=None, concurrency=MAX_CONCURRENT_PAGES, limit=PAGE_LIMIT):
+        self.api = api
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.concurrency = concurrency
+        self.limit = limit
+        self.total_pages = None
+        # One entry per page (offset, seconds, bytes, attempts, status), where
+        # seconds include retries and waits, plus the totals spent waiting on
+        # the rate limiter and in backoff; recorded in import_runs
+        self.page_timings = []
+        self.bytes_received = 0
+        self.rate_limit_wait = 0.0
+        self.backoff_wait = 0.0
+        self.stats_lock = threading.Lock()
+
+    def get_page(self, url, offset):
+        # Returns the decoded page, or None when the API has no records there.
+        # 429 and 5xx answers are retried with exponential backoff (or the
+        # server's Retry-After) before giving up.
+        started = time.perf_counter()
+        received = 0
+        for attempt in range(MAX_RETRIES + 1):
+            waited = time.perf_counter()
+            self.rate_limiter.acquire()
+            self._add_wait("rate_limit_wait", time.perf_counter() - waited)
+            try:
+                response = self.api.get(url, params={"limit": self.limit, "offset": offset})
+            except httpx.TransportError:
+                if attempt == MAX_RETRIES:
+                    raise
+                self._backoff(backoff_delay(attempt))
+                continue
+
+            received += len(response.content)
+            if response.status_code == 404:
+                self._record_page(offset, started, received, attempt + 1, 404)
+                return None
+            if response.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                self._backoff(retry_after(response) or backoff_delay(attempt))
+                continue
+            self._record_page(offset, started, received, attempt + 1, response.status_code)
+            response.raise_for_status()
+            return response.json()
+
+    def _backoff(self, delay):
+        self._add_wait("backoff_wait", delay)
+        time.sleep(delay)
+
+    def _add_wait(self, name, seconds):
+        with self.stats_lock:
+            setattr(self, name, getattr(self, name) + seconds)
+
+    def _record_page(self, offset, started, received, attempts, status):
+        with self.stats_lock:
+            self.bytes_received += received
+            self.page_timings.append({
+                "offset": offset,
+                "seconds": round(time.perf_counter() - started, 6),
+                "bytes": received,
+                "attempts": attempts,
+                "status": status,
+            })
+
+    def iter_pages(self, url, items_path, total_path=None):
+        # Yields (offset, items) in offset order as pages arrive. The first
+        # page tells us the total count, so the remaining pages are requested
+        # `concurrency` at a time while the caller processes earlier ones;
+        # at most twice that many pages are held in memory. Without a total
+        # the pages are walked one by one until a short page.
+        first = self.get_page(url, 0)
+        first_items = as_list(dig(first, items_path)) if first else []
+        yield 0, first_items
+
+        total = dig(first, total_path) if first and total_path else None
+        if total is None:
+            yield from self._iter_sequential(url, items_path, len(first_items))
+            return
+
+        self.total_pages = math.ceil(int(total) / self.limit)
+        offsets = iter(range(self.limit, int(total), self.limit))
+        window = self.concurrency * 2
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            pending = deque()
+            for offset in offsets:
+                pending.append((offset, pool.submit(self.get_page, url, offset)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                offset, future = pending.popleft()
+                page = future.result()
+                # Below TotalCount a 404 means the API lost a page, not
+                # that the data ended
+                if page is None:
+                    raise RuntimeError(f"{url}: no records at offset {offset} of {total}")
+                next_offset = next(offsets, None)
+                if next_offset is not None:
+                    pending.append((next_offset, pool.submit(self.get_page, url, next_offset)))
+                yield offset, as_list(dig(page, items_path)) if page else []
+
+    def fetch_all(self, url, items_path, total_path=None, on_page=None):
+        items = []
+        for offset, page_items in self.iter_pages(url, items_path, total_path):
+            if on_page:
+                on_page(offset, page_items)
+            items.extend(page_items)
+        return items
+
+    def _iter_sequential(self, url, items_path, count):
+        offset = self.limit
+        while count == self.limit:
+            page = self.get_page(url, offset)
+            page_items = as_list(dig(page, items_path)) if page else []
+            yield offset, page_items
+            count = len(page_items)
+            offset += self.limit
+
+
+def backoff_delay(attempt):
+    return min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+def retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
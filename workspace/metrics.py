@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+
+# -------------------------------
+# Prometheus text-format metrics
+# -------------------------------
+# A small in-process registry for the Flask app: counters, gauges and
+# histograms with labels, rendered in the Prometheus exposition format by
+# GET /metrics. Values are per process: under gunicorn each worker keeps
+# its own, and a scrape is answered by whichever worker takes it (see the
+# pid label on flask_process_info).
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+IMPORT_DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.lock = threading.Lock()
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    # Either updated directly or, with a callback, read at scrape time from
+    # a value kept elsewhere (the callback returns None to skip the sample)
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=(), callback=None):
+        super().__init__(name, help_text, labels)
+        self.values = {}
+        self.callback = callback
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        if self.callback is not None:
+            value = self.callback()
+            if value is None:
+                return []
+            with self.lock:
+                self.values[()] = value
+        with self.lock:
+            values = dict(self.values)
+        return self.header() + [
+            f"{self.name}{format_labels(self.label_names, labels)} {format_value(value)}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *label_values, value):
+        with self.lock:
+            self.values[label_values] = value
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [bucket counts..., sum, count]
+        self.series = {}
+
+    def observe(self, *label_values, value):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        with self.lock:
+            series = {labels: list(values) for labels, values in self.series.items()}
+        lines = self.header()
+        for labels, values in sorted(series.items()):
+            for bound, count in zip(self.buckets + (float("inf"),), values[:len(self.buckets)] + [values[-1]]):
+                bucket_labels = format_labels(self.label_names + ("le",), labels + (format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {count}")
+            plain = format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{plain} {format_value(values[-2])}")
+            lines.append(f"{self.name}_count{plain} {values[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=(), callback=None):
+        return self.register(Counter(name, help_text, labels, callback))
+
+    def gauge(self, name, help_text, labels=(), callback=None):
+        return self.register(Gauge(name, help_text, labels, callback))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------------
+# Process metrics
+# -------------------------------
+PROCESS_START_TIME = time.time()
+
+
+def resident_memory_bytes():
+    # Linux only; other platforms simply do not report it
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
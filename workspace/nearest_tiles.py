@@ -0,0 +1,131 @@
+import os
+import json
+import threading
+import numpy as np
+from geo_distance import EARTH_RADIUS_KM, HaversineEngine
+from airport_index import TIE_TOLERANCE, to_unit_vectors
+
+# -------------------------------
+# Nearest-airport tiles
+# -------------------------------
+# The globe is cut into TILE_DEGREES x TILE_DEGREES tiles of 1/CELLS_PER_TILE
+# sized cells. Each cell lists every airport that can be the nearest one
+# for some point inside it, so the web page fetches a tile once and answers
+# clicks in that area with a haversine over a handful of candidates, with
+# the same result (and distance) as POST /closest_airport.
+#
+# Candidates: with d the distance from the cell centre to its nearest
+# airport and r the distance from the centre to the cell's far corner, the
+# nearest airport of any point in the cell is within d + r of that point
+# and so within d + 2r of the centre.
+TILE_DEGREES = int(os.getenv("NEAREST_TILE_DEGREES", "10"))
+CELLS_PER_TILE = int(os.getenv("NEAREST_TILE_CELLS", "10"))
+
+if 180 % TILE_DEGREES:
+    raise ValueError("NEAREST_TILE_DEGREES must divide 180")
+
+TILE_FIELDS = ["AirportCode", "CityCode", "CountryName", "Latitude", "Longitude"]
+
+
+def tile_origins():
+    # South-west corner of every tile
+    return [
+        (lat, lon)
+        for lat in range(-90, 90, TILE_DEGREES)
+        for lon in range(-180, 180, TILE_DEGREES)
+    ]
+
+
+def is_tile_origin(lat, lon):
+    return (
+        -90 <= lat < 90 and -180 <= lon < 180
+        and lat % TILE_DEGREES == 0 and lon % TILE_DEGREES == 0
+    )
+
+
+def tile_airport(airport):
+    # MySQL DECIMAL coordinates and missing text fields as plain JSON values
+    code, city, country = (
+        value if isinstance(value, str) else None
+        for value in (airport["AirportCode"], airport["CityCode"], airport["CountryName"])
+    )
+    return [code, city, country, float(airport["Latitude"]), float(airport["Longitude"])]
+
+
+def chord_for_km(distance_km):
+    angle = np.minimum(np.asarray(distance_km) / EARTH_RADIUS_KM, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+class NearestTiles:
+    # Tiles for one AirportSnapshot. Each tile is built on first use (or by
+    # build_all() in the background) and kept as encoded JSON, so a new
+    # snapshot, and with it a new generation, always starts a new tile set.
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.tiles = {}
+        self.lock = threading.Lock()
+
+    def manifest(self):
+        return {
+            "generation": self.snapshot.generation,
+            "tile_degrees": TILE_DEGREES,
+            "cells_per_tile": CELLS_PER_TILE,
+            "fields": TILE_FIELDS,
+        }
+
+    def tile(self, lat, lon):
+        # Encoded JSON for the tile whose south-west corner is (lat, lon)
+        key = (lat, lon)
+        encoded = self.tiles.get(key)
+        if encoded is None:
+            encoded = json.dumps(self._build(lat, lon), separators=(",", ":")).encode()
+            with self.lock:
+                encoded = self.tiles.setdefault(key, encoded)
+        return encoded
+
+    def build_all(self):
+        for lat, lon in tile_origins():
+            self.tile(lat, lon)
+
+    def stats(self):
+        with self.lock:
+            sizes = [len(encoded) for encoded in self.tiles.values()]
+        return {"tiles": len(sizes), "bytes": sum(sizes), "total_tiles": len(tile_origins())}
+
+    def _build(self, lat0, lon0):
+        index = self.snapshot.index
+        step = TILE_DEGREES / CELLS_PER_TILE
+        # Cell rows run south to north, columns west to east
+        south = lat0 + step * np.arange(CELLS_PER_TILE)
+        west = lon0 + step * np.arange(CELLS_PER_TILE)
+        cell_south, cell_west = (grid.ravel() for grid in np.meshgrid(south, west, indexing="ij"))
+        centre_lat = cell_south + step / 2
+        centre_lon = cell_west + step / 2
+
+        centres = HaversineEngine(centre_lat, centre_lon)
+        corner_km = np.max([
+            centres.distances_to(cell_south + dlat, cell_west + dlon, np.arange(len(centre_lat)))
+            for dlat in (0, step) for dlon in (0, step)
+        ], axis=0)
+        _, nearest_km = index.nearest_many(centre_lat, centre_lon)
+
+        reach_km = nearest_km + 2 * corner_km
+        radii = chord_for_km(reach_km) * (1 + TIE_TOLERANCE) + 1e-6
+        hits = index.tree.query_ball_point(to_unit_vectors(centre_lat, centre_lon), r=radii)
+
+        # Candidates are kept in table order so the page breaks distance
+        # ties the same way the API does
+        cells = [np.sort(index.positions[np.asarray(cell, dtype=np.intp)]) for cell in hits]
+        positions = np.unique(np.concatenate(cells))
+        local = {position: i for i, position in enumerate(positions.tolist())}
+        airports = [tile_airport(airport) for airport in self.snapshot.airports(positions)]
+        return {
+            "generation": self.snapshot.generation,
+            "lat": lat0,
+            "lon": lon0,
+            "tile_degrees": TILE_DEGREES,
+            "cells_per_tile": CELLS_PER_TILE,
+            "airports": airports,
+            "cells": [[local[position] for position in cell.tolist()] for cell in cells],
+        }
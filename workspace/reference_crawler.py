@@ -0,0 +1,167 @@
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from lufthansa_client import PageFetcher, as_list, dig
+from airport_sync import INSERT_BATCH_SIZE
+
+# -------------------------------
+# Reference dataset declarations
+# -------------------------------
+# A dataset is an endpoint, where its items and total count sit in the
+# response, and the columns of the table its items are flattened into (see
+# reference_datasets.py). Everything else, from paging to loading, is
+# shared by ReferenceCrawler.
+class Column:
+    # `path` is looked up in each API item; `transform`, if given, turns
+    # the value found there into the stored one
+    def __init__(self, name, sql_type, path, transform=None):
+        self.name = name
+        self.sql_type = sql_type
+        self.path = tuple(path)
+        self.transform = transform
+
+    def extract(self, item):
+        value = dig(item, self.path)
+        return self.transform(value) if self.transform else value
+
+
+class ReferenceDataset:
+    def __init__(self, name, url, items_path, total_path, table, columns, key):
+        self.name = name
+        self.url = url
+        self.items_path = tuple(items_path)
+        self.total_path = tuple(total_path)
+        self.table = table
+        self.columns = list(columns)
+        self.key = key
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns] + ["UpdatedAt"]
+
+    def create_table_sql(self):
+        definitions = ",\n".join(
+            f"        {column.name} {column.sql_type}" + (" NOT NULL" if column.name == self.key else "")
+            for column in self.columns
+        )
+        return f"""
+    CREATE TABLE IF NOT EXISTS {self.table} (
+{definitions},
+        UpdatedAt TIMESTAMP NULL,
+        PRIMARY KEY ({self.key})
+    )
+"""
+
+    def flatten(self, items, run_at):
+        # Items without a key cannot be stored and are skipped
+        rows = []
+        for item in items:
+            row = {column.name: column.extract(item) for column in self.columns}
+            if row[self.key] is None:
+                continue
+            row["UpdatedAt"] = run_at
+            rows.append(row)
+        return rows
+
+
+# -------------------------------
+# Flattening helpers
+# -------------------------------
+def english_name(names):
+    # Names.Name is one {"@LanguageCode", "$"} object or a list of them
+    names = as_list(names)
+    for name in names:
+        if isinstance(name, dict) and name.get("@LanguageCode", "").upper() == "EN":
+            return name.get("$")
+    return names[0].get("$") if names and isinstance(names[0], dict) else None
+
+
+def joined(values):
+    # A code or a list of codes, stored comma-separated
+    values = as_list(values)
+    return ",".join(str(value) for value in values) if values else None
+
+
+# -------------------------------
+# Bulk load
+# -------------------------------
+def load_reference_table(engine, dataset, rows):
+    # Reference tables are small, so each run simply replaces the table's
+    # contents in one transaction; readers keep seeing the previous rows
+    # until it commits. An empty crawl never wipes a table.
+    if not rows:
+        raise RuntimeError(f"The API returned no {dataset.name}; keeping the existing {dataset.table} table")
+
+    column_list = ", ".join(dataset.column_names)
+    placeholders = ", ".join(f":{column}" for column in dataset.column_names)
+    # Later pages win if the API repeats a key
+    updates = ", ".join(f"{column} = VALUES({column})" for column in dataset.column_names if column != dataset.key)
+    statement = text(f"""
+        INSERT INTO {dataset.table} ({column_list}) VALUES ({placeholders})
+        ON DUPLICATE KEY UPDATE {updates}
+    """)
+
+    # CREATE TABLE commits implicitly in MySQL, so it runs on its own
+    with engine.begin() as conn:
+        conn.execute(text(dataset.create_table_sql()))
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {dataset.table}"))
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            conn.execute(statement, rows[start:start + INSERT_BATCH_SIZE])
+        total = conn.execute(text(f"SELECT COUNT(*) FROM {dataset.table}")).scalar()
+    return total
+
+
+# -------------------------------
+# Concurrent crawler
+# -------------------------------
+class ReferenceCrawler:
+    # Crawls every dataset on its own thread. All of them share the
+    # LufthansaClient (one token, one connection pool) and one rate
+    # limiter, so together they stay within the API's calls per second,
+    # including alongside the airports import when it uses the same limiter.
+    def __init__(self, api, engine, datasets, rate_limiter, page_concurrency=1):
+        self.api = api
+        self.engine = engine
+        self.datasets = list(datasets)
+        self.rate_limiter = rate_limiter
+        self.page_concurrency = page_concurrency
+        self.executor = None
+        self.futures = {}
+
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=max(1, len(self.datasets)), thread_name_prefix="reference")
+        self.futures = {dataset.name: self.executor.submit(self.crawl, dataset) for dataset in self.datasets}
+
+    def results(self):
+        # Waits for every dataset; returns {name: result dict or exception}
+        results = {}
+        for name, future in self.futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+        self.executor.shutdown()
+        return results
+
+    def crawl(self, dataset):
+        run_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        fetcher = PageFetcher(self.api, self.rate_limiter, concurrency=self.page_concurrency)
+        started = time.perf_counter()
+        rows = []
+        pages = 0
+        for _, items in fetcher.iter_pages(dataset.url, dataset.items_path, dataset.total_path):
+            rows.extend(dataset.flatten(items, run_at))
+            pages += 1
+        fetched = time.perf_counter()
+        total = load_reference_table(self.engine, dataset, rows)
+        return {
+            "table": dataset.table,
+            "pages": pages,
+            "rows": len(rows),
+            "total": total,
+            "bytes": fetcher.bytes_received,
+            "fetch_seconds": fetched - started,
+            "load_seconds": time.perf_counter() - fetched,
+        }
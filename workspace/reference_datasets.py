@@ -0,0 +1,65 @@
+from reference_crawler import Column, ReferenceDataset, english_name, joined
+
+# -------------------------------
+# Lufthansa reference datasets
+# -------------------------------
+# Crawled by ReferenceCrawler alongside the airports import. Adding a
+# dataset means adding an entry here (and its table to init.sql); the
+# table is also created on first load if it does not exist yet.
+REFERENCE_DATASETS = [
+    ReferenceDataset(
+        name="airlines",
+        url="/v1/references/airlines",
+        items_path=("AirlineResource", "Airlines", "Airline"),
+        total_path=("AirlineResource", "Meta", "TotalCount"),
+        table="airlines",
+        key="AirlineID",
+        columns=[
+            Column("AirlineID", "VARCHAR(10)", ["AirlineID"]),
+            Column("AirlineICAO", "VARCHAR(10)", ["AirlineID_ICAO"]),
+            Column("AirlineName", "VARCHAR(255)", ["Names", "Name"], english_name),
+        ],
+    ),
+    ReferenceDataset(
+        name="cities",
+        url="/v1/references/cities",
+        items_path=("CityResource", "Cities", "City"),
+        total_path=("CityResource", "Meta", "TotalCount"),
+        table="cities",
+        key="CityCode",
+        columns=[
+            Column("CityCode", "VARCHAR(10)", ["CityCode"]),
+            Column("CountryCode", "VARCHAR(10)", ["CountryCode"]),
+            Column("CityName", "VARCHAR(255)", ["Names", "Name"], english_name),
+            Column("UtcOffset", "VARCHAR(10)", ["UtcOffset"]),
+            Column("TimeZoneId", "VARCHAR(64)", ["TimeZoneId"]),
+            Column("AirportCodes", "TEXT", ["Airports", "AirportCode"], joined),
+        ],
+    ),
+    ReferenceDataset(
+        name="countries",
+        url="/v1/references/countries",
+        items_path=("CountryResource", "Countries", "Country"),
+        total_path=("CountryResource", "Meta", "TotalCount"),
+        table="countries",
+        key="CountryCode",
+        columns=[
+            Column("CountryCode", "VARCHAR(10)", ["CountryCode"]),
+            Column("ZoneCode", "VARCHAR(10)", ["ZoneCode"]),
+            Column("CountryName", "VARCHAR(255)", ["Names", "Name"], english_name),
+        ],
+    ),
+    ReferenceDataset(
+        name="aircraft",
+        url="/v1/references/aircraft",
+        items_path=("AircraftResource", "AircraftSummaries", "AircraftSummary"),
+        total_path=("AircraftResource", "Meta", "TotalCount"),
+        table="aircraft",
+        key="AircraftCode",
+        columns=[
+            Column("AircraftCode", "VARCHAR(10)", ["AircraftCode"]),
+            Column("AircraftName", "VARCHAR(255)", ["Names", "Name"], english_name),
+            Column("AirlineEquipCode", "VARCHAR(10)", ["AirlineEquipCode"]),
+        ],
+    ),
+]
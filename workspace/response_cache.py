@@ -0,0 +1,66 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+# -------------------------------
+# LRU + TTL response cache
+# -------------------------------
+class ResponseCache:
+    # Thread-safe LRU cache with an entry limit and a time-to-live. Entries
+    # belong to one airport data generation: the first lookup for another
+    # generation empties the cache, so answers never outlive the data they
+    # were computed from.
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.generation = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, generation):
+        with self.lock:
+            self._check_generation(generation)
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, generation, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self._check_generation(generation)
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+
+    def _check_generation(self, generation):
+        if generation != self.generation:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.generation = generation
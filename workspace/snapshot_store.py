@@ -0,0 +1,108 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from data_generation import ensure_generations_table, read_generation
+
+# -------------------------------
+# Local airport snapshot files
+# -------------------------------
+# The importer writes the airports it just synced next to the data, so the
+# Flask app can start from disk in milliseconds instead of waiting for
+# MySQL. Coordinates are a memory-mappable .npy array; the text columns and
+# the data generation live in manifest.json. Every file is written to a
+# temporary name and renamed into place, and the manifest goes last, so a
+# reader sees either the old snapshot or the new one, never half of each.
+#
+#   tmp/airport_snapshot/manifest.json
+#   tmp/airport_snapshot/coordinates-<generation>.npy
+SNAPSHOT_DIR = os.getenv(
+    "AIRPORT_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tmp", "airport_snapshot")
+)
+SNAPSHOT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+TEXT_COLUMNS = ["AirportCode", "CityCode", "CountryCode", "CountryName"]
+COORDINATE_COLUMNS = ["Latitude", "Longitude"]
+
+
+def read_airports(conn):
+    # Read the generation first: if an import lands in between, the next
+    # poll sees a newer generation and reloads again
+    ensure_generations_table(conn)
+    generation = read_generation(conn)
+    return pd.read_sql("SELECT * FROM airports", conn), generation
+
+
+def write_snapshot_file(df_airports, generation, directory=SNAPSHOT_DIR):
+    os.makedirs(directory, exist_ok=True)
+    coordinates_name = f"coordinates-{generation}.npy"
+
+    coordinates = np.ascontiguousarray(
+        df_airports[COORDINATE_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    )
+    replace_file(
+        os.path.join(directory, coordinates_name),
+        lambda f: np.save(f, coordinates, allow_pickle=False),
+        binary=True
+    )
+
+    text_columns = df_airports.reindex(columns=TEXT_COLUMNS).astype(object)
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "generation": int(generation),
+        "count": len(df_airports),
+        "written_at": time.time(),
+        "coordinates": coordinates_name,
+        "columns": {
+            column: text_columns[column].where(text_columns[column].notna(), None).tolist()
+            for column in TEXT_COLUMNS
+        }
+    }
+    replace_file(os.path.join(directory, MANIFEST_NAME), lambda f: json.dump(manifest, f))
+
+    # Older coordinate files are no longer referenced by the manifest
+    for name in os.listdir(directory):
+        if name.startswith("coordinates-") and name != coordinates_name:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def read_snapshot_file(directory=SNAPSHOT_DIR):
+    # Returns (df_airports, generation), or None when there is no usable
+    # snapshot on disk. A manifest that is not an object or lacks a key
+    # counts as unusable, like a missing one.
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != SNAPSHOT_FORMAT:
+            return None
+        coordinates = np.load(
+            os.path.join(directory, manifest["coordinates"]), mmap_mode="r", allow_pickle=False
+        )
+        count = manifest["count"]
+        columns = {column: list(manifest["columns"][column]) for column in TEXT_COLUMNS}
+        generation = manifest["generation"]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+    if coordinates.shape != (count, len(COORDINATE_COLUMNS)):
+        return None
+    if any(len(values) != count for values in columns.values()):
+        return None
+
+    # object dtype keeps NULLs as None, as pd.read_sql does
+    df_airports = pd.DataFrame(columns, dtype=object)
+    for i, column in enumerate(COORDINATE_COLUMNS):
+        df_airports[column] = coordinates[:, i]
+    return df_airports, generation
+
+
+def replace_file(path, write, binary=False):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb" if binary else "w") as f:
+        write(f)
+    os.replace(temp_path, path)
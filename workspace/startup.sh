@@ -13,5 +13,10 @@ echo "Importing airlines data..."
 python3 airlines_api_call.py
 
 # Start the Flask app
-echo "Starting Flask app..."
-python3 user_input.py
\ No newline at end of file
+if [ "${SERVING_MODE}" = "wsgi" ]; then
+    echo "Starting Flask app under gunicorn..."
+    gunicorn -c gunicorn.conf.py wsgi:app
+else
+    echo "Starting Flask app..."
+    python3 user_input.py
+fi
\ No newline at end of file
@@ -0,0 +1,201 @@
+import argparse
+import json
+import random
+import string
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# -------------------------------
+# Local stand-in for the Lufthansa API
+# -------------------------------
+# Serves /v1/oauth/token and the airports, airlines, cities, countries
+# and aircraft reference endpoints with the same response shape as the
+# real API, so the importer can be run and timed without credentials or
+# network access:
+#
+#   python3 stub_lufthansa_server.py --airports 1200 --error-rate 0.05
+#   LUFTHANSA_BASE_URL=http://localhost:8080 python3 airlines_api_call.py
+
+parser = argparse.ArgumentParser(description="Stub Lufthansa reference data API")
+parser.add_argument("--port", type=int, default=8080)
+parser.add_argument("--airports", type=int, default=1200)
+parser.add_argument("--reference-items", type=int, default=300, help="items in each other reference dataset")
+parser.add_argument("--error-rate", type=float, default=0.0, help="share of page requests answered with 429/503")
+parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every page response")
+parser.add_argument("--seed", type=int, default=0)
+parser.add_argument("--token-ttl", type=int, default=129600, help="expires_in of issued tokens, in seconds")
+
+
+def make_airports(count, seed):
+    rng = random.Random(seed)
+    countries = ["DE", "FR", "US", "GB", "ES", "IT", "CN", "BR", "IN", "ZA"]
+    airports = []
+    for i in range(count):
+        code = "".join(rng.choice(string.ascii_uppercase) for _ in range(2)) + f"{i:04d}"
+        airports.append({
+            "AirportCode": code,
+            "Position": {"Coordinate": {
+                "Latitude": round(rng.uniform(-90, 90), 6),
+                "Longitude": round(rng.uniform(-180, 180), 6)
+            }},
+            "CityCode": code[:3],
+            "CountryCode": rng.choice(countries),
+            "LocationType": "Airport",
+            "Names": {"Name": {"@LanguageCode": "EN", "$": f"Airport {code}"}},
+            "UtcOffset": "+01:00",
+            "TimeZoneId": "Europe/Berlin"
+        })
+    return airports
+
+
+def names(rng, english):
+    # Like the real API: one name object, or a list with other languages
+    name = {"@LanguageCode": "EN", "$": english}
+    if rng.random() < 0.5:
+        return {"Name": name}
+    return {"Name": [{"@LanguageCode": "DE", "$": f"{english} (DE)"}, name]}
+
+
+def make_airlines(count, seed):
+    rng = random.Random(seed + 1)
+    return [{
+        "AirlineID": f"{string.ascii_uppercase[i // 26 % 26]}{string.ascii_uppercase[i % 26]}{i // 676 or ''}",
+        "AirlineID_ICAO": "".join(rng.choice(string.ascii_uppercase) for _ in range(3)),
+        "Names": names(rng, f"Airline {i}")
+    } for i in range(count)]
+
+
+def make_cities(count, seed):
+    rng = random.Random(seed + 2)
+    cities = []
+    for i in range(count):
+        code = f"C{i:04d}"
+        airports = [f"{code}{n}" for n in range(rng.randint(1, 3))]
+        cities.append({
+            "CityCode": code,
+            "CountryCode": rng.choice(["DE", "FR", "US", "GB", "ES"]),
+            "Names": names(rng, f"City {i}"),
+            "UtcOffset": "+01:00",
+            "TimeZoneId": "Europe/Berlin",
+            "Airports": {"AirportCode": airports if len(airports) > 1 else airports[0]}
+        })
+    return cities
+
+
+def make_countries(count, seed):
+    rng = random.Random(seed + 3)
+    return [{
+        "CountryCode": f"{string.ascii_uppercase[i // 26 % 26]}{string.ascii_uppercase[i % 26]}",
+        "ZoneCode": rng.choice(["EU", "NA", "AS"]),
+        "Names": names(rng, f"Country {i}")
+    } for i in range(min(count, 676))]
+
+
+def make_aircraft(count, seed):
+    rng = random.Random(seed + 4)
+    return [{
+        "AircraftCode": f"{i:03d}",
+        "Names": names(rng, f"Aircraft {i}"),
+        "AirlineEquipCode": f"{i:03d}"
+    } for i in range(count)]
+
+
+# path -> (resource, collection, item) keys the real API nests items under
+RESOURCES = {
+    "/v1/references/airports": ("AirportResource", "Airports", "Airport"),
+    "/v1/references/airlines": ("AirlineResource", "Airlines", "Airline"),
+    "/v1/references/cities": ("CityResource", "Cities", "City"),
+    "/v1/references/countries": ("CountryResource", "Countries", "Country"),
+    "/v1/references/aircraft": ("AircraftResource", "AircraftSummaries", "AircraftSummary"),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # path -> items served there
+    datasets = {}
+    error_rate = 0.0
+    latency = 0.0
+    token_ttl = 129600
+    # Tokens issued by this server instance; anything else gets a 401
+    tokens = {}
+    stats = {"token_requests": 0, "page_requests": 0, "errors_injected": 0}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def count(self, key):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/v1/oauth/token":
+            return self.send_json(404, {"error": "not found"})
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.count("token_requests")
+        token = uuid.uuid4().hex
+        self.tokens[token] = time.time() + self.token_ttl
+        self.send_json(200, {"access_token": token, "token_type": "bearer", "expires_in": self.token_ttl})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stats":
+            return self.send_json(200, self.stats)
+        if url.path not in RESOURCES:
+            return self.send_json(404, {"error": "not found"})
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if self.tokens.get(token, 0) < time.time():
+            return self.send_json(401, {"error": "invalid or expired token"})
+
+        self.count("page_requests")
+        if random.random() < self.error_rate:
+            self.count("errors_injected")
+            status = random.choice([429, 503])
+            return self.send_json(status, {"error": "injected"}, {"Retry-After": "0.1"} if status == 429 else None)
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+        query = parse_qs(url.query)
+        limit = int(query.get("limit", ["100"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        items = self.datasets[url.path]
+        page = items[offset:offset + limit]
+        if not page:
+            return self.send_json(404, {"ProcessingErrors": {"ProcessingError": {"Description": "No records found"}}})
+
+        resource, collection, item = RESOURCES[url.path]
+        self.send_json(200, {resource: {
+            collection: {item: page if len(page) > 1 else page[0]},
+            "Meta": {"@Version": "1.0.0", "TotalCount": len(items)}
+        }})
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    random.seed(args.seed)
+    StubHandler.datasets = {
+        "/v1/references/airports": make_airports(args.airports, args.seed),
+        "/v1/references/airlines": make_airlines(args.reference_items, args.seed),
+        "/v1/references/cities": make_cities(args.reference_items, args.seed),
+        "/v1/references/countries": make_countries(args.reference_items, args.seed),
+        "/v1/references/aircraft": make_aircraft(args.reference_items, args.seed),
+    }
+    StubHandler.error_rate = args.error_rate
+    StubHandler.latency = args.latency
+    StubHandler.token_ttl = args.token_ttl
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), StubHandler)
+    print(f"Stub Lufthansa API with {args.airports} airports on http://localhost:{args.port}")
+    server.serve_forever()
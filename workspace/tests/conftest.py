@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The workspace modules are plain scripts imported by name (see user_input.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,156 @@
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from geo_distance import HaversineEngine, haversine
+from airport_index import RANK_DECIMALS, AirportIndex
+
+# -------------------------------
+# Fixtures
+# -------------------------------
+# Random airports plus the awkward cases: both poles, both sides of the
+# antimeridian, duplicated coordinates and a row without coordinates
+EDGE_AIRPORTS = [
+    (90.0, 0.0), (-90.0, 45.0), (0.0, 180.0), (0.0, -180.0), (10.0, 179.999), (10.0, -179.999),
+    (48.8566, 2.3522), (48.8566, 2.3522), (48.8566, 2.3522),
+]
+EDGE_POINTS = [
+    (90.0, 0.0), (90.0, 123.0), (-90.0, -180.0), (0.0, 180.0), (0.0, -180.0), (10.0, 180.0),
+    (48.8566, 2.3522), (0.0, 0.0), (-45.5, 179.9999),
+]
+
+
+@pytest.fixture(scope="module")
+def airports():
+    rng = np.random.default_rng(42)
+    lats = list(rng.uniform(-90, 90, 500).round(6)) + [lat for lat, _ in EDGE_AIRPORTS] + [None]
+    lons = list(rng.uniform(-180, 180, 500).round(6)) + [lon for _, lon in EDGE_AIRPORTS] + [None]
+    return pd.DataFrame({"Latitude": lats, "Longitude": lons})
+
+
+@pytest.fixture(scope="module")
+def index(airports):
+    return AirportIndex(airports)
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    return list(zip(rng.uniform(-90, 90, 300), rng.uniform(-180, 180, 300))) + EDGE_POINTS
+
+
+def scan(airports, lat, lon):
+    # The reference: haversine to every airport with coordinates, in row order
+    return {
+        position: haversine(lat, lon, row_lat, row_lon)
+        for position, (row_lat, row_lon) in enumerate(zip(airports["Latitude"], airports["Longitude"]))
+        if row_lat is not None and not math.isnan(row_lat)
+    }
+
+
+def ranked(distances):
+    # Ordered by distance, ties by row position like Series.idxmin(). The
+    # same point can differ in the last bit between formulas (+180/-180
+    # longitude), so distances are compared at the index's rank precision.
+    return sorted(distances, key=lambda position: (round(distances[position], RANK_DECIMALS), position))
+
+
+# -------------------------------
+# AirportIndex against a full scan
+# -------------------------------
+def test_nearest_matches_scan(airports, index, points):
+    for lat, lon in points:
+        distances = scan(airports, lat, lon)
+        position, distance = index.nearest(lat, lon)
+        assert position == ranked(distances)[0]
+        assert distance == pytest.approx(distances[position], rel=1e-12, abs=1e-9)
+
+
+def test_duplicate_coordinates_resolve_to_first_row(airports, index):
+    position, distance = index.nearest(48.8566, 2.3522)
+    assert position == 506
+    assert distance == pytest.approx(0.0, abs=1e-9)
+
+
+def test_nearest_many_matches_nearest(index, points):
+    lats, lons = zip(*points)
+    positions, distances = index.nearest_many(lats, lons)
+    for (lat, lon), position, distance in zip(points, positions, distances):
+        expected_position, expected_distance = index.nearest(lat, lon)
+        assert position == expected_position
+        assert distance == pytest.approx(expected_distance, rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("k", [1, 3, 10])
+def test_k_nearest_matches_scan(airports, index, points, k):
+    for lat, lon in points:
+        distances = scan(airports, lat, lon)
+        positions, result = index.k_nearest(lat, lon, k)
+        expected = ranked(distances)[:k]
+        assert positions.tolist() == expected
+        assert result == pytest.approx([distances[position] for position in expected], rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("radius_km", [50.0, 750.0, 2500.0])
+def test_within_radius_matches_scan(airports, index, points, radius_km):
+    for lat, lon in points:
+        distances = scan(airports, lat, lon)
+        positions, result = index.within_radius(lat, lon, radius_km)
+        expected = [position for position in ranked(distances) if distances[position] <= radius_km]
+        assert positions.tolist() == expected
+        assert result == pytest.approx([distances[position] for position in expected], rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("radius_km, limit", [(750.0, 5), (2500.0, 20), (30000.0, 100)])
+def test_within_radius_limit_keeps_the_closest(index, points, radius_km, limit):
+    for lat, lon in points:
+        positions, result = index.within_radius(lat, lon, radius_km)
+        limited, limited_result = index.within_radius(lat, lon, radius_km, limit=limit)
+        assert limited.tolist() == positions[:limit].tolist()
+        assert limited_result == pytest.approx(result[:limit], rel=1e-12, abs=1e-9)
+
+
+def test_rows_without_coordinates_are_skipped(airports, index):
+    assert len(index) == len(airports) - 1
+    assert len(airports) - 1 not in index.positions
+
+
+# -------------------------------
+# HaversineEngine against the scalar formula
+# -------------------------------
+def test_engine_distances_from_match_scalar(airports, points):
+    valid = airports.dropna()
+    engine = HaversineEngine(valid["Latitude"], valid["Longitude"])
+    for lat, lon in points:
+        expected = [haversine(lat, lon, row_lat, row_lon) for row_lat, row_lon in zip(valid["Latitude"], valid["Longitude"])]
+        assert engine.distances_from(lat, lon) == pytest.approx(expected, rel=1e-12, abs=1e-9)
+        subset = np.arange(0, len(valid), 7)
+        assert engine.distances_from(lat, lon, subset) == pytest.approx(np.asarray(expected)[subset], rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("max_cells", [1, 5000, 10 ** 9])
+def test_engine_distances_from_many_match_scalar(airports, points, max_cells):
+    valid = airports.dropna()
+    engine = HaversineEngine(valid["Latitude"], valid["Longitude"])
+    lats, lons = zip(*points)
+    chunks = list(engine.distances_from_many(lats, lons, max_cells=max_cells))
+    assert [start for start, _ in chunks] == sorted({start for start, _ in chunks})
+    assert all(matrix.size <= max(max_cells, len(engine)) for _, matrix in chunks)
+
+    matrix = np.vstack([matrix for _, matrix in chunks])
+    assert matrix.shape == (len(points), len(valid))
+    for row, (lat, lon) in enumerate(points):
+        expected = [haversine(lat, lon, row_lat, row_lon) for row_lat, row_lon in zip(valid["Latitude"], valid["Longitude"])]
+        assert matrix[row] == pytest.approx(expected, rel=1e-12, abs=1e-9)
+
+
+def test_engine_distances_to_match_scalar(airports, points):
+    valid = airports.dropna()
+    engine = HaversineEngine(valid["Latitude"], valid["Longitude"])
+    lats, lons = zip(*points)
+    positions = np.arange(len(points)) % len(valid)
+    expected = [
+        haversine(lat, lon, valid["Latitude"].iloc[position], valid["Longitude"].iloc[position])
+        for lat, lon, position in zip(lats, lons, positions)
+    ]
+    assert engine.distances_to(lats, lons, positions) == pytest.approx(expected, rel=1e-12, abs=1e-9)
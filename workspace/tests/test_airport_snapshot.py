@@ -0,0 +1,59 @@
+import json
+from decimal import Decimal
+import pytest
+import pandas as pd
+from flask import Flask, json as flask_json
+from airport_snapshot import AirportSnapshot
+from snapshot_store import MANIFEST_NAME, read_snapshot_file, write_snapshot_file
+
+# -------------------------------
+# Fixtures
+# -------------------------------
+def mysql_airports():
+    # As pd.read_sql returns them from MySQL: DECIMAL coordinates as Decimal
+    return pd.DataFrame({
+        "AirportCode": ["FRA", "JFK", "XNA"],
+        "CityCode": ["FRA", "NYC", None],
+        "CountryCode": ["DE", "US", "US"],
+        "CountryName": ["Germany", "United States", None],
+        "Latitude": [Decimal("50.033333"), Decimal("40.639751"), None],
+        "Longitude": [Decimal("8.570556"), Decimal("-73.778925"), None],
+    })
+
+
+def as_json(snapshot):
+    app = Flask(__name__)
+    with app.app_context():
+        return flask_json.dumps([dict(record) for record in snapshot.records])
+
+
+# -------------------------------
+# Snapshot contents
+# -------------------------------
+def test_file_and_mysql_snapshots_serialise_alike(tmp_path):
+    from_mysql = AirportSnapshot(mysql_airports(), 7)
+    write_snapshot_file(mysql_airports(), 7, directory=tmp_path)
+    df_airports, generation = read_snapshot_file(directory=tmp_path)
+    from_file = AirportSnapshot(df_airports, generation)
+
+    assert as_json(from_file) == as_json(from_mysql)
+    assert from_mysql.airport(0)["Latitude"] == 50.033333
+    assert from_mysql.airport(2)["Latitude"] is None
+
+
+# -------------------------------
+# Broken snapshot files
+# -------------------------------
+@pytest.mark.parametrize("change", [
+    lambda manifest: [manifest],
+    lambda manifest: {key: value for key, value in manifest.items() if key != "count"},
+    lambda manifest: {key: value for key, value in manifest.items() if key != "generation"},
+    lambda manifest: {**manifest, "columns": None},
+    lambda manifest: {**manifest, "columns": {**manifest["columns"], "CityCode": 3}},
+    lambda manifest: {**manifest, "count": 2},
+])
+def test_unusable_manifest_is_ignored(tmp_path, change):
+    write_snapshot_file(mysql_airports(), 7, directory=tmp_path)
+    path = tmp_path / MANIFEST_NAME
+    path.write_text(json.dumps(change(json.loads(path.read_text()))))
+    assert read_snapshot_file(directory=tmp_path) is None
@@ -0,0 +1,136 @@
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from airport_sync import AIRPORT_COLUMNS, STAGING_TABLE, content_hashes, diff_staging, to_rows
+
+# -------------------------------
+# SQLite stand-in for MySQL
+# -------------------------------
+# Like benchmark.py, the tables live in SQLite; the staging table is a
+# plain table under the name AirportSync gives its temporary one
+TABLE_COLUMNS = """(
+    AirportCode VARCHAR(10) PRIMARY KEY,
+    CityCode VARCHAR(10),
+    CountryCode VARCHAR(10),
+    CountryName VARCHAR(100),
+    Latitude DECIMAL(10, 6),
+    Longitude DECIMAL(10, 6),
+    ContentHash CHAR(32)
+)"""
+STORED_COLUMNS = AIRPORT_COLUMNS + ["ContentHash"]
+
+
+def api_airports():
+    # As flatten_airports() and CountryNames build them: floats, NaN for
+    # missing coordinates and codes, None for unknown country names
+    return pd.DataFrame({
+        "AirportCode": ["FRA", "JFK", "NRT", "XNA"],
+        "CityCode": ["FRA", "NYC", np.nan, "XNA"],
+        "CountryCode": ["DE", "US", "JP", "US"],
+        "CountryName": ["Germany", "United States", None, "United States"],
+        "Latitude": [50.033333, 40.639751, 35.764722, np.nan],
+        "Longitude": [8.570556, -73.778925, 140.386389, np.nan],
+    })
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE airports {TABLE_COLUMNS}"))
+        conn.execute(text(f"CREATE TABLE {STAGING_TABLE} {TABLE_COLUMNS}"))
+    yield engine
+    engine.dispose()
+
+
+def sqlite_value(value):
+    # sqlite3 cannot bind Decimal; the hash is computed before this
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def store(engine, table, df):
+    columns = ", ".join(STORED_COLUMNS)
+    placeholders = ", ".join(f":{column}" for column in STORED_COLUMNS)
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {table}"))
+        conn.execute(
+            text(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"),
+            [{column: sqlite_value(row[column]) for column in STORED_COLUMNS} for row in to_rows(df)]
+        )
+
+
+def read_back(engine):
+    # What the next run sees from MySQL: DECIMAL coordinates as Decimal
+    with engine.connect() as conn:
+        df = pd.read_sql(text(f"SELECT {', '.join(AIRPORT_COLUMNS)} FROM airports ORDER BY AirportCode"), conn)
+    for column in ["Latitude", "Longitude"]:
+        df[column] = [None if pd.isna(value) else Decimal(f"{value:.6f}") for value in df[column]]
+    return df
+
+
+def diff(engine, df_api):
+    store(engine, STAGING_TABLE, df_api)
+    with engine.connect() as conn:
+        return diff_staging(conn)
+
+
+# -------------------------------
+# Content hashes
+# -------------------------------
+def test_hash_ignores_value_representation():
+    df = api_airports()
+    decimals = df.astype(object)
+    decimals["Latitude"] = [None if pd.isna(value) else Decimal(f"{value:.6f}") for value in df["Latitude"]]
+    decimals["Longitude"] = [None if pd.isna(value) else Decimal(str(value)) for value in df["Longitude"]]
+    nones = df.astype(object).where(df.notna(), None)
+    padded = df.assign(Latitude=df["Latitude"] + 1e-9)
+
+    expected = content_hashes(df).tolist()
+    assert content_hashes(decimals).tolist() == expected
+    assert content_hashes(nones).tolist() == expected
+    assert content_hashes(padded).tolist() == expected
+
+
+@pytest.mark.parametrize("column, value", [
+    ("CityCode", "FRX"), ("CountryCode", "AT"), ("CountryName", "Austria"),
+    ("Latitude", 50.033334), ("Longitude", np.nan),
+])
+def test_hash_changes_with_every_field(column, value):
+    df = api_airports()
+    changed = df.copy()
+    changed.loc[0, column] = value
+    assert content_hashes(changed)[0] != content_hashes(df)[0]
+    assert content_hashes(changed)[1:].tolist() == content_hashes(df)[1:].tolist()
+
+
+# -------------------------------
+# Diff against the stored table
+# -------------------------------
+def test_unchanged_crawl_changes_nothing(engine):
+    store(engine, "airports", api_airports())
+    assert diff(engine, api_airports()) == ([], [], [])
+    # Rows read back from the table hash the same as the API's
+    assert diff(engine, read_back(engine)) == ([], [], [])
+
+
+def test_one_changed_field_is_one_update(engine):
+    store(engine, "airports", api_airports())
+    df_api = api_airports()
+    df_api.loc[df_api["AirportCode"] == "JFK", "CountryName"] = "USA"
+    assert diff(engine, df_api) == ([], ["JFK"], [])
+
+
+def test_missing_code_is_a_delete_and_new_code_an_insert(engine):
+    store(engine, "airports", api_airports())
+    df_api = api_airports()
+    df_api.loc[df_api["AirportCode"] == "NRT", "AirportCode"] = "HND"
+    assert diff(engine, df_api) == (["HND"], [], ["NRT"])
+
+
+def test_rows_without_hash_count_as_changed(engine):
+    store(engine, "airports", api_airports())
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE airports SET ContentHash = NULL WHERE AirportCode = 'FRA'"))
+    assert diff(engine, api_airports()) == ([], ["FRA"], [])
@@ -1,10 +1,22 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
-import pandas as pd
 from sqlalchemy import create_engine, text
-import math
 import time
 import logging
+import io
+import csv
+import json
+import os
+import threading
+from airport_snapshot import AirportSnapshot
+from data_generation import read_generation
+from snapshot_store import read_airports, read_snapshot_file
+from airport_summaries import read_sync_summary, read_top_countries
+from import_jobs import ImportJobQueue, ImportQueueBusy
+from import_runs import read_import_run
+from nearest_tiles import is_tile_origin
+from response_cache import ResponseCache
+from metrics import IMPORT_DURATION_BUCKETS, PROCESS_START_TIME, Registry, resident_memory_bytes
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -15,13 +27,36 @@ CORS(app)
 
 # Global variables
 engine = None
-df_airports = None
+# Read-only AirportSnapshot; handlers grab a reference once and never mutate it
+airport_snapshot = None
+refresh_lock = threading.Lock()
+refresher_pid = None
+
+# How often each process checks data_generations for a newer import
+SNAPSHOT_POLL_SECONDS = int(os.getenv("SNAPSHOT_POLL_SECONDS", "30"))
+
+# Single nearest-airport lookups are answered for coordinates rounded to
+# CACHE_PRECISION decimals (4 is about 11 m) and cached per rounded pair.
+# Rounding only exists to share cache entries, so with the cache disabled
+# (CLOSEST_AIRPORT_CACHE_SIZE=0) coordinates are used as given.
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("CLOSEST_AIRPORT_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("CLOSEST_AIRPORT_CACHE_TTL", "3600"))
+)
+CACHE_PRECISION = (
+    int(os.getenv("CLOSEST_AIRPORT_CACHE_PRECISION", "4")) if response_cache.maxsize > 0 else None
+)
 
 # -------------------------------
 # Database connection and data loading
 # -------------------------------
 def init_app():
-    global engine, df_airports
+    global engine, airport_snapshot
+    
+    # Start from the snapshot file the importer wrote when there is one;
+    # MySQL is then only read if that file is behind the published generation
+    if load_snapshot_file():
+        return True
     
     # Initialize database connection
     engine = create_db_connection()
@@ -31,13 +66,52 @@ def init_app():
     
     # Load airports data
     try:
-        df_airports = load_airports_data()
-        logger.info(f"Successfully loaded {len(df_airports)} airports")
+        df_airports, generation = load_airports_data()
+        logger.info(f"Successfully loaded {len(df_airports)} airports (generation {generation})")
+        airport_snapshot = AirportSnapshot(df_airports, generation)
+        logger.info(f"Built spatial index over {len(airport_snapshot.index)} airports")
         return True
     except Exception as e:
         logger.error(f"Failed to load airports data: {e}")
         return False
 
+def load_snapshot_file():
+    global engine, airport_snapshot
+
+    started = time.time()
+    loaded = read_snapshot_file()
+    if loaded is None:
+        logger.info("No airport snapshot file found, loading from the database")
+        return False
+
+    df_airports, generation = loaded
+    try:
+        airport_snapshot = AirportSnapshot(df_airports, generation)
+    except Exception as e:
+        # An empty file or one without usable coordinates: MySQL decides
+        logger.warning(f"Ignoring airport snapshot file generation {generation}: {e}")
+        return False
+    logger.info(
+        f"Loaded airport snapshot file generation {generation} "
+        f"({len(airport_snapshot)} airports in {time.time() - started:.3f}s)"
+    )
+
+    # No connection retries here: the file is already being served and the
+    # refresher keeps checking for newer generations
+    engine = create_db_engine()
+    try:
+        refresh_airport_snapshot()
+    except Exception as e:
+        logger.warning(f"Could not check the snapshot file against the database: {e}")
+    return True
+
+def create_db_engine():
+    return create_engine(
+        "mysql+pymysql://myuser:mypassword@db:3306/mydb",
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
+
 def create_db_connection():
     # Retry logic for database connection
     max_retries = 10
@@ -45,11 +119,7 @@ def create_db_connection():
     
     for i in range(max_retries):
         try:
-            engine = create_engine(
-                "mysql+pymysql://myuser:mypassword@db:3306/mydb",
-                pool_pre_ping=True,
-                pool_recycle=3600
-            )
+            engine = create_db_engine()
             # Test connection
             with engine.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -73,13 +143,13 @@ def load_airports_data():
     
     for i in range(max_retries):
         try:
-            with engine.connect() as conn:
+            with engine.begin() as conn:
                 # Check if airports table exists and has data
                 result = conn.execute(text("SELECT COUNT(*) FROM airports"))
                 count = result.scalar()
                 if count > 0:
                     logger.info(f"Found {count} airports in database")
-                    return pd.read_sql("SELECT * FROM airports", conn)
+                    return read_airports(conn)
                 else:
                     logger.info("Airports table is empty, waiting for data...")
                     time.sleep(retry_delay)
@@ -89,22 +159,69 @@ def load_airports_data():
     
     raise Exception("Could not load airports data after multiple attempts")
 
-# Initialize the application
-app_initialized = init_app()
-
 # -------------------------------
-# Haversine formula
+# Hot reload of the airport snapshot
 # -------------------------------
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371  # Earth radius in km
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
+def refresh_airport_snapshot():
+    # Rebuilds the snapshot when a newer generation has been published and
+    # swaps it in with a single assignment. Requests already running keep
+    # the snapshot they started with.
+    global airport_snapshot
+
+    with refresh_lock:
+        with engine.connect() as conn:
+            generation = read_generation(conn)
+        current = airport_snapshot
+        if current is not None and current.generation == generation:
+            return False
+
+        started = time.time()
+        with engine.begin() as conn:
+            df_airports, generation = read_airports(conn)
+        snapshot = AirportSnapshot(df_airports, generation)
+        airport_snapshot = snapshot
+        logger.info(
+            f"Swapped in airport snapshot generation {generation} "
+            f"({len(snapshot)} airports, built in {time.time() - started:.2f}s)"
+        )
+        return True
+
+def try_refresh_airport_snapshot():
+    try:
+        refresh_airport_snapshot()
+    except Exception as e:
+        logger.warning(f"Airport snapshot refresh failed: {e}")
+
+def warm_nearest_tiles():
+    # Builds every tile of the current snapshot before the map asks for it;
+    # tiles that already exist are skipped, so this is cheap to repeat
+    snapshot = airport_snapshot
+    if snapshot is None:
+        return
+    try:
+        snapshot.tiles.build_all()
+    except Exception as e:
+        logger.warning(f"Could not build nearest-airport tiles for generation {snapshot.generation}: {e}")
+
+def snapshot_refresh_loop():
+    warm_nearest_tiles()
+    while True:
+        time.sleep(SNAPSHOT_POLL_SECONDS)
+        try_refresh_airport_snapshot()
+        warm_nearest_tiles()
+
+def start_snapshot_refresher():
+    # Threads do not survive fork(), so every serving process (the dev
+    # server, or each gunicorn worker via post_fork) starts its own poller
+    global refresher_pid
+    if refresher_pid == os.getpid() or engine is None:
+        return
+    refresher_pid = os.getpid()
+    threading.Thread(target=snapshot_refresh_loop, name="snapshot-refresher", daemon=True).start()
+
+# Initialize the application
+app_initialized = init_app()
 
-    a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))  # <-- fixed here
-    return R * c
 # -------------------------------
 # Serve HTML template
 # -------------------------------
@@ -118,61 +235,397 @@ def index():
 @app.route("/closest_airport", methods=["POST"])
 def closest_airport():
     # Check if app is initialized
-    if not app_initialized or df_airports is None:
+    snapshot = airport_snapshot
+    if not app_initialized or snapshot is None:
         return jsonify({"error": "Application is still initializing. Please try again in a few moments."}), 503
     
     data = request.get_json()
-    if not data or "latitude" not in data or "longitude" not in data:
-        return jsonify({"error": "Please provide latitude and longitude"}), 400
+    user_lat, user_lon, error = parse_coordinates(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Optional k-nearest / radius search, answered as a list ordered by distance
+    if "k" in data or "radius_km" in data:
+        k, radius_km, error = parse_neighbour_query(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        truncated = None
+        if radius_km is None:
+            positions, distances = snapshot.index.k_nearest(user_lat, user_lon, k)
+        else:
+            # At most k (or MAX_K) airports, however large the radius. One
+            # more is looked up to tell clients whether the list was cut.
+            limit = k or MAX_K
+            positions, distances = snapshot.index.within_radius(user_lat, user_lon, radius_km, limit=limit + 1)
+            truncated = len(positions) > limit
+            positions, distances = positions[:limit], distances[:limit]
+
+        airports = snapshot.airports(positions)
+        response = {
+            "airports": [airport_payload(airport, distance_km) for airport, distance_km in zip(airports, distances)]
+        }
+        if truncated is not None:
+            response["truncated"] = truncated
+        return jsonify(response)
+
+    # Nearest-neighbour lookup on the spatial index. The answer is computed
+    # for the rounded coordinates, so a cached entry is exactly what a fresh
+    # lookup for the same key would return.
+    key = (user_lat, user_lon)
+    if CACHE_PRECISION is not None:
+        key = (round(user_lat, CACHE_PRECISION), round(user_lon, CACHE_PRECISION))
+    payload = response_cache.get(key, snapshot.generation)
+    if payload is None:
+        position, distance_km = snapshot.index.nearest(*key)
+        payload = airport_payload(snapshot.airport(position), distance_km)
+        response_cache.put(key, snapshot.generation, payload)
+
+    return jsonify(payload)
+
+# Same validation rules for single and batch lookups; returns (lat, lon, error)
+def parse_coordinates(data):
+    if not isinstance(data, dict) or "latitude" not in data or "longitude" not in data:
+        return None, None, "Please provide latitude and longitude"
 
     try:
         user_lat = float(data["latitude"])
         user_lon = float(data["longitude"])
-    except ValueError:
-        return jsonify({"error": "Invalid latitude or longitude values"}), 400
+    except (TypeError, ValueError):
+        return None, None, "Invalid latitude or longitude values"
 
     # Validate coordinates
     if not (-90 <= user_lat <= 90) or not (-180 <= user_lon <= 180):
-        return jsonify({"error": "Coordinates out of valid range"}), 400
+        return None, None, "Coordinates out of valid range"
 
-    # Calculate distances
-    df_airports["DistanceKm"] = df_airports.apply(
-        lambda row: haversine(user_lat, user_lon, row["Latitude"], row["Longitude"]), axis=1
-    )
+    return user_lat, user_lon, None
 
-    closest = df_airports.loc[df_airports["DistanceKm"].idxmin()]
+MAX_K = 100
 
-    return jsonify({
+def parse_neighbour_query(data):
+    # Returns (k, radius_km, error); either value is None when not requested
+    k = radius_km = None
+    if data.get("k") is not None:
+        # int() would take true as 1 and 2.7 as 2
+        if isinstance(data["k"], bool):
+            return None, None, "k must be an integer"
+        try:
+            k = int(data["k"])
+        except (TypeError, ValueError, OverflowError):
+            return None, None, "k must be an integer"
+        if isinstance(data["k"], float) and data["k"] != k:
+            return None, None, "k must be an integer"
+        if not (1 <= k <= MAX_K):
+            return None, None, f"k must be between 1 and {MAX_K}"
+
+    if data.get("radius_km") is not None:
+        try:
+            radius_km = float(data["radius_km"])
+        except (TypeError, ValueError):
+            return None, None, "radius_km must be a number"
+        if not radius_km > 0:
+            return None, None, "radius_km must be positive"
+
+    if k is None and radius_km is None:
+        return None, None, "Please provide k or radius_km"
+    return k, radius_km, None
+
+def airport_payload(closest, distance_km):
+    return {
         "AirportCode": closest["AirportCode"],
         "CityCode": closest["CityCode"],
         "CountryName": closest["CountryName"],
         "Latitude": closest["Latitude"],
         "Longitude": closest["Longitude"],
-        "DistanceKm": round(closest["DistanceKm"], 2)
+        "DistanceKm": round(float(distance_km), 2)
+    }
+
+# -------------------------------
+# Batch API endpoint
+# -------------------------------
+BATCH_CHUNK_SIZE = 1000
+
+@app.route("/closest_airport/batch", methods=["POST"])
+def closest_airport_batch():
+    # Accepts a JSON array (or {"coordinates": [...]}) of latitude/longitude
+    # objects, or a streamed NDJSON / CSV body with the same fields. JSON in
+    # gives a JSON array back; NDJSON and CSV are answered as streamed NDJSON.
+    snapshot = airport_snapshot
+    if not app_initialized or snapshot is None:
+        return jsonify({"error": "Application is still initializing. Please try again in a few moments."}), 503
+
+    content_type = request.mimetype
+    if content_type in ("application/x-ndjson", "application/ndjson"):
+        rows = read_ndjson_rows(request.stream)
+    elif content_type == "text/csv":
+        rows = read_csv_rows(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            data = data.get("coordinates")
+        if not isinstance(data, list):
+            return jsonify({"error": "Please provide a list of coordinates"}), 400
+        return jsonify({"results": list(resolve_batch(snapshot, data))})
+
+    def generate():
+        for result in resolve_batch(snapshot, rows):
+            yield app.json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def read_ndjson_rows(stream):
+    for line in io.TextIOWrapper(stream, encoding="utf-8"):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+def read_csv_rows(stream):
+    yield from csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+
+def resolve_batch(snapshot, rows):
+    # Validates each row and resolves the valid ones chunk by chunk, so only
+    # BATCH_CHUNK_SIZE coordinates are held in memory at any time.
+    chunk = []
+    for row_number, data in enumerate(rows):
+        chunk.append((row_number, *parse_coordinates(data)))
+        if len(chunk) == BATCH_CHUNK_SIZE:
+            yield from resolve_chunk(snapshot, chunk)
+            chunk = []
+    if chunk:
+        yield from resolve_chunk(snapshot, chunk)
+
+def resolve_chunk(snapshot, chunk):
+    valid = [row for row in chunk if row[3] is None]
+    closest = {}
+    if valid:
+        positions, distances = snapshot.index.nearest_many(
+            [row[1] for row in valid], [row[2] for row in valid]
+        )
+        airports = snapshot.airports(positions)
+        for row, airport, distance_km in zip(valid, airports, distances):
+            closest[row[0]] = airport_payload(airport, distance_km)
+
+    for row_number, _, _, error in chunk:
+        if error:
+            yield {"index": row_number, "error": error}
+        else:
+            yield {"index": row_number, **closest[row_number]}
+
+# -------------------------------
+# Nearest-airport tiles
+# -------------------------------
+# The map page resolves clicks from these tiles (see nearest_tiles.py). A
+# tile URL names its generation, so it never changes and browsers may keep
+# it for good; the manifest says which generation is current.
+TILE_MAX_AGE = 31536000
+
+@app.route("/nearest_tiles")
+def nearest_tiles_manifest():
+    snapshot = airport_snapshot
+    if not app_initialized or snapshot is None:
+        return jsonify({"error": "Application is still initializing. Please try again in a few moments."}), 503
+
+    # The page rounds clicks to `precision` decimals, as closest_airport
+    # does; null when the cache is disabled and nothing is rounded
+    response = jsonify({
+        **snapshot.tiles.manifest(),
+        "precision": CACHE_PRECISION,
+        "url": "/nearest_tiles/{generation}/{lat}/{lon}",
     })
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+@app.route("/nearest_tiles/<int:generation>/<int(signed=True):lat>/<int(signed=True):lon>")
+def nearest_tile(generation, lat, lon):
+    snapshot = airport_snapshot
+    if not app_initialized or snapshot is None:
+        return jsonify({"error": "Application is still initializing. Please try again in a few moments."}), 503
+    # Tiles of older generations are gone; the page reloads the manifest
+    if generation != snapshot.generation:
+        return jsonify({"error": "Unknown tile generation", "generation": snapshot.generation}), 404
+    if not is_tile_origin(lat, lon):
+        return jsonify({"error": "Unknown tile"}), 404
+
+    response = Response(snapshot.tiles.tile(lat, lon), mimetype="application/json")
+    response.headers["Cache-Control"] = f"public, max-age={TILE_MAX_AGE}, immutable"
+    response.set_etag(f"{generation}-{lat}-{lon}")
+    return response.make_conditional(request)
+
+# -------------------------------
+# Data import jobs
+# -------------------------------
+import_jobs = None
+
+def get_import_jobs():
+    global import_jobs
+    if import_jobs is None and engine is not None:
+        # Refresh this process's snapshot as soon as its own import finishes
+        # instead of waiting for the next poll
+        import_jobs = ImportJobQueue(
+            engine,
+            ["python3", "-u", "airlines_api_call.py"],
+            on_success=try_refresh_airport_snapshot,
+            on_finish=record_import_job
+        )
+    return import_jobs
 
-import subprocess
 @app.route("/run_data_import", methods=["POST"])
 def run_data_import():
     try:
-        # Run the script using subprocess
-        result = subprocess.run(
-            ["python3", "airlines_api_call.py"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return jsonify({
-            "status": "success",
-            "output": result.stdout
-        }), 200
+        queue = get_import_jobs()
+        if queue is None:
+            return jsonify({"status": "error", "message": "Database connection not available"}), 503
+        job, created = queue.submit()
+    except ImportQueueBusy as e:
+        logger.warning(f"Could not queue data import: {e}")
+        return jsonify({"status": "error", "message": "Another import request is being queued, please retry"}), 503
+    except Exception as e:
+        logger.error(f"Could not queue data import: {e}")
+        return jsonify({"status": "error", "message": "Could not queue data import"}), 500
 
-    except subprocess.CalledProcessError as e:
-        return jsonify({
-            "status": "error",
-            "message": "Script execution failed",
-            "stderr": e.stderr
-        }), 500
+    return jsonify({
+        "status": job["status"],
+        "job_id": job["job_id"],
+        "coalesced": not created,
+        "status_url": f"/jobs/{job['job_id']}"
+    }), 202
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    try:
+        queue = get_import_jobs()
+        if queue is None:
+            return jsonify({"status": "error", "message": "Database connection not available"}), 503
+        job = queue.get(job_id)
+    except Exception as e:
+        logger.error(f"Could not read import job {job_id}: {e}")
+        return jsonify({"status": "error", "message": "Could not read import job"}), 500
+
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+
+    # Stage timings and counts the importer recorded for this job, once it has finished
+    job["run"] = None
+    if job["status"] in ("succeeded", "failed"):
+        try:
+            with engine.connect() as conn:
+                job["run"] = read_import_run(conn, job_id)
+        except Exception as e:
+            logger.warning(f"Could not read import run for job {job_id}: {e}")
+    return jsonify(job)
+
+
+# -------------------------------
+# Pre-aggregated data summary
+# -------------------------------
+@app.route("/data_summary")
+def data_summary():
+    # Reads the small summary tables the importer maintains; never scans airports
+    if engine is None:
+        return jsonify({"status": "error", "message": "Database connection not available"}), 503
+
+    try:
+        with engine.connect() as conn:
+            summary = read_sync_summary(conn)
+            top_countries = read_top_countries(conn)
+    except Exception as e:
+        logger.error(f"Could not read data summary: {e}")
+        return jsonify({"status": "error", "message": "Could not read data summary"}), 500
+
+    if summary is None:
+        return jsonify({"status": "error", "message": "No import has completed yet"}), 404
+    return jsonify({"summary": summary, "top_countries": top_countries})
+
+
+# -------------------------------
+# Prometheus metrics
+# -------------------------------
+metrics_registry = Registry()
+
+def snapshot_value(read):
+    snapshot = airport_snapshot
+    return read(snapshot) if snapshot is not None else None
+
+def pool_value(read):
+    return read(engine.pool) if engine is not None else None
+
+process_info = metrics_registry.gauge("flask_process_info", "Process answering this scrape", labels=("pid",))
+metrics_registry.gauge("process_start_time_seconds", "Start time of the process since the epoch",
+                       callback=lambda: PROCESS_START_TIME)
+metrics_registry.gauge("process_resident_memory_bytes", "Resident memory of the process",
+                       callback=resident_memory_bytes)
+
+request_count = metrics_registry.counter(
+    "flask_http_requests_total", "HTTP requests handled", labels=("endpoint", "method", "status"))
+request_latency = metrics_registry.histogram(
+    "flask_http_request_duration_seconds", "Time to produce the response", labels=("endpoint", "method"))
+requests_in_flight = metrics_registry.gauge(
+    "flask_http_requests_in_flight", "Requests being handled right now", labels=("endpoint",))
+
+metrics_registry.gauge("airport_snapshot_generation", "Data generation of the airport snapshot being served",
+                       callback=lambda: snapshot_value(lambda snapshot: snapshot.generation))
+metrics_registry.gauge("airport_snapshot_age_seconds", "Seconds since the airport snapshot was built",
+                       callback=lambda: snapshot_value(lambda snapshot: time.time() - snapshot.loaded_at))
+metrics_registry.gauge("airport_snapshot_airports", "Airports in the snapshot being served",
+                       callback=lambda: snapshot_value(len))
+
+metrics_registry.gauge("db_pool_size", "Configured size of the database connection pool",
+                       callback=lambda: pool_value(lambda pool: pool.size()))
+metrics_registry.gauge("db_pool_checked_out", "Database connections currently checked out",
+                       callback=lambda: pool_value(lambda pool: pool.checkedout()))
+metrics_registry.gauge("db_pool_overflow", "Connections opened beyond the pool size",
+                       callback=lambda: pool_value(lambda pool: max(0, pool.overflow())))
+
+metrics_registry.counter("closest_airport_cache_hits_total", "Response cache hits",
+                         callback=lambda: response_cache.hits)
+metrics_registry.counter("closest_airport_cache_misses_total", "Response cache misses",
+                         callback=lambda: response_cache.misses)
+metrics_registry.gauge("closest_airport_cache_entries", "Entries in the response cache",
+                       callback=lambda: len(response_cache.entries))
+
+import_job_duration = metrics_registry.histogram(
+    "import_job_duration_seconds", "Duration of import jobs run by this process",
+    labels=("status",), buckets=IMPORT_DURATION_BUCKETS)
+
+def record_import_job(status, seconds):
+    import_job_duration.observe(status, value=seconds)
+
+@app.before_request
+def start_request_metrics():
+    # Rule patterns, not raw paths, keep /jobs/<job_id> to one series
+    g.metrics_endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+    g.metrics_started = time.perf_counter()
+    requests_in_flight.inc(g.metrics_endpoint)
+
+@app.after_request
+def record_request_metrics(response):
+    # Streamed responses are timed until their first byte is ready
+    endpoint = g.get("metrics_endpoint")
+    if endpoint is not None:
+        request_latency.observe(endpoint, request.method, value=time.perf_counter() - g.metrics_started)
+        request_count.inc(endpoint, request.method, str(response.status_code))
+        g.metrics_recorded = True
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    endpoint = g.pop("metrics_endpoint", None)
+    if endpoint is None:
+        return
+    if not g.pop("metrics_recorded", False):
+        # The handler raised before a response was built
+        request_latency.observe(endpoint, request.method, value=time.perf_counter() - g.metrics_started)
+        request_count.inc(endpoint, request.method, "500")
+    requests_in_flight.dec(endpoint)
+
+@app.route("/metrics")
+def metrics():
+    process_info.values.clear()
+    process_info.set(str(os.getpid()), value=1)
+    return Response(metrics_registry.render(), mimetype="text/plain; version=0.0.4")
 
 
 # Health check endpoint
@@ -186,13 +639,18 @@ def health():
         else:
             db_status = "disconnected"
         
-        airports_count = len(df_airports) if df_airports is not None else 0
+        snapshot = airport_snapshot
+        airports_count = len(snapshot) if snapshot is not None else 0
+        generation = snapshot.generation if snapshot is not None else None
         app_status = "ready" if app_initialized else "initializing"
         
         return jsonify({
             "status": app_status,
             "database": db_status,
-            "airports_count": airports_count
+            "airports_count": airports_count,
+            "data_generation": generation,
+            "response_cache": response_cache.stats(),
+            "nearest_tiles": snapshot.tiles.stats() if snapshot is not None else None
         })
     except Exception as e:
         return jsonify({"status": "error", "error": str(e)}), 500
@@ -200,10 +658,12 @@ def health():
 # Endpoint to check if airports data is loaded
 @app.route("/status")
 def status():
-    if app_initialized and df_airports is not None and len(df_airports) > 0:
-        return jsonify({"status": "ready", "airports_count": len(df_airports)})
+    snapshot = airport_snapshot
+    if app_initialized and snapshot is not None and len(snapshot) > 0:
+        return jsonify({"status": "ready", "airports_count": len(snapshot), "data_generation": snapshot.generation})
     else:
         return jsonify({"status": "initializing", "message": "Application is still initializing"}), 503
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
\ No newline at end of file
+    start_snapshot_refresher()
+    app.run(host="0.0.0.0", port=5000, debug=True, threaded=True)
\ No newline at end of file
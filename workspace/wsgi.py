@@ -0,0 +1,10 @@
+# -------------------------------
+# WSGI entry point
+# -------------------------------
+# Importing user_input runs init_app(), so with preload_app (see
+# gunicorn.conf.py) the airport snapshot is built once in the master
+# process before the workers are forked.
+from user_input import app
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5000)